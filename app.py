@@ -1,19 +1,20 @@
 import streamlit as st
-import pyttsx3
 import os
 import base64
 import sys
-import time 
 import speech_recognition as sr
 from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
 import av
 import numpy as np
 import soundfile as sf
 
-from traductor_kichwa.main import traducir_oracion, normalizar_texto
-from PIL import Image
+from traductor_kichwa.traduccion import traducir_oracion
 from streamlit.components.v1 import html
 from traductor_kichwa.db.consultas import buscar_todas_traducciones
+from traductor_kichwa.interfaz import iniciar_estado, panel_traduccion, rerun_panel
+from traductor_kichwa.utils.estaticos import publicar_archivo, servicio_estatico_activo, url_estatica
+from traductor_kichwa.utils.imagenes import imagen_redimensionada
+from traductor_kichwa.utils.metricas import iniciar_servidor_metricas
 
 class AudioProcessor(AudioProcessorBase):
     def __init__(self):
@@ -31,24 +32,6 @@ class AudioProcessor(AudioProcessorBase):
         self.frames = []
 
 # === FUNCIONES DE AUDIO ===
-@st.cache_resource
-def get_tts_engine():
-    engine = pyttsx3.init()
-    engine.setProperty('rate', 100)      # Más lento (valor típico: 100-150)
-    engine.setProperty('volume', 0.8)    # Más suave (0.0 a 1.0)
-    engine.setProperty('voice', 'spanish')
-    return engine
-
-def text_to_audio(text):
-    engine = get_tts_engine()
-    temp_filename = 'temp_audio.mp3'
-    engine.save_to_file(text, temp_filename)
-    engine.runAndWait()
-    with open(temp_filename, 'rb') as f:
-        audio_bytes = f.read()
-    os.remove(temp_filename)  # Elimina el archivo temporal
-    return audio_bytes
-
 def speech_to_text():
     recognizer = sr.Recognizer()
     mic = sr.Microphone()
@@ -86,8 +69,8 @@ def speech_to_text():
                     
             except Exception as e:
                 st.session_state["traduccion"] = ""            
-            # Forzar actualización inmediata de la interfaz
-            st.rerun()
+            # Forzar actualización inmediata del panel (no de toda la página)
+            rerun_panel()
                 
         except sr.UnknownValueError:
             st.markdown('''
@@ -136,13 +119,14 @@ IMAGEN_FONDO = 'banner_v5.png'  # 👈 Pon aquí el nombre de tu imagen de fondo
 titulo = "TRADUCTOR ESPAÑOL - KICHWA"
 st.set_page_config(page_title=titulo, page_icon="🌎", layout="wide")
 
-# Obtener la imagen de fondo en base64 de forma segura
+# /metrics en formato Prometheus (TRADUCTOR_METRICAS_PUERTO, 0 para desactivarlo); solo arranca una vez
+iniciar_servidor_metricas()
+
+# Ruta de la imagen de fondo
 bg_image_path = os.path.join(IMGS_PATH, IMAGEN_FONDO)  # 👈 Usa la variable configurada arriba
-bg_image_b64 = get_image_base64(bg_image_path)
 
 # CSS base más seguro
 base_css = """
-<style>
 @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
 
 :root {
@@ -167,9 +151,8 @@ base_css = """
 """
 
 # CSS adicional solo si la imagen existe
-background_css = ""
-if bg_image_b64:
-    background_css = f"""
+def css_fondo(url_fondo):
+    return f"""
 /* Imagen de fondo con transparencia */
 .stApp::before {{
     content: '';
@@ -178,7 +161,7 @@ if bg_image_b64:
     left: 0;
     width: 100%;
     height: 100%;
-    background-image: url('data:image/png;base64,{bg_image_b64}');
+    background-image: url('{url_fondo}');
     background-size: cover;
     background-position: center;
     background-repeat: no-repeat;
@@ -188,8 +171,7 @@ if bg_image_b64:
 }}
 """
 
-# Aplicar estilos CSS
-st.markdown(base_css + background_css + """
+resto_css = """
 .main {
     background: rgba(255, 255, 255, 0.95);
     border-radius: 24px;
@@ -471,8 +453,31 @@ div[data-testid="column"] {
 div[data-testid="stHorizontalBlock"] {
     gap: 1rem !important;
 }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def compilar_tema():
+    """
+    Una vez por proceso: arma el <style> del tema que va en línea en cada rerun. La
+    imagen de fondo se publica como estático con hash (utils/estaticos.py) y el CSS
+    solo lleva su URL con ?v=<hash>; sin static serving (o sin permiso de escritura),
+    la imagen va en base64 como antes.
+    """
+    fondo = ""
+    if servicio_estatico_activo():
+        try:
+            publicada = publicar_archivo(bg_image_path)
+            if publicada:
+                fondo = css_fondo(url_estatica(publicada))
+        except OSError as e:
+            print(f"No se pudo publicar la imagen de fondo: {e}")
+    if not fondo:
+        bg_image_b64 = get_image_base64(bg_image_path)
+        fondo = css_fondo(f"data:image/png;base64,{bg_image_b64}") if bg_image_b64 else ""
+    return "<style>" + base_css + fondo + resto_css + "</style>"
+
+# Aplicar estilos CSS
+st.markdown(compilar_tema(), unsafe_allow_html=True)
 
 # Layout con imágenes a los costados
 col_izq, col_centro, col_der = st.columns([0.8, 6.4, 0.8])
@@ -498,10 +503,8 @@ with col_izq:
         
         if os.path.exists(imagen_path):
             try:
-                img = Image.open(imagen_path)
-                # Redimensionar manteniendo la proporción
-                img = img.resize((150, 200), Image.Resampling.LANCZOS)
-                st.image(img, width=150)
+                # Decodificada y redimensionada una sola vez por proceso (utils/imagenes.py)
+                st.image(imagen_redimensionada(imagen_path, 150, 200), width=150)
             except Exception as e:
                 # Fallback si hay error cargando la imagen específica
                 st.markdown(f'''
@@ -527,19 +530,7 @@ with col_izq:
             ''', unsafe_allow_html=True)
 
 with col_centro:
-    # Inicializar variables de sesión si no existen
-    if "texto_entrada" not in st.session_state:
-        st.session_state["texto_entrada"] = ""
-    if "traduccion" not in st.session_state:
-        st.session_state["traduccion"] = ""
-    if "last_input_time" not in st.session_state:
-        st.session_state["last_input_time"] = 0
-    if "grabando_audio" not in st.session_state:
-        st.session_state["grabando_audio"] = False
-    if "audio_grabado" not in st.session_state:
-        st.session_state["audio_grabado"] = None
-    if "auto_transcribiendo" not in st.session_state:
-        st.session_state["auto_transcribiendo"] = False
+    iniciar_estado()
 
     # Header modernizado
     st.markdown(f'''
@@ -574,110 +565,8 @@ with col_centro:
     </div>
     ''', unsafe_allow_html=True)
 
-    # Container de entrada modernizado
-    st.markdown('<div class="input-container fade-in">', unsafe_allow_html=True)
-    st.markdown('<div class="input-label">✍️ Ingresa una oracion o palabra a traducir</div>', unsafe_allow_html=True)
-    
-    texto_entrada = st.text_area(
-        label="Área de texto para entrada",
-        value=st.session_state["texto_entrada"],
-        height=100,
-        max_chars=500,
-        placeholder="Escribe aquí tu oración o palabra en español...",
-        key="texto_entrada_area",
-        label_visibility="collapsed"
-    )
-    
-    # Grid de botones modernizado
-    st.markdown('<div class="button-grid">', unsafe_allow_html=True)
-    col_btn1, col_btn2, col_btn3 = st.columns(3)
-    
-    with col_btn1:
-        btn_traducir = st.button("Traducir Oración", key="btn_traducir", use_container_width=True)
-    with col_btn2:
-        btn_voz = st.button("Voz a Texto", key="btn_voz", use_container_width=True)
-        if btn_voz:
-            speech_to_text()
-    with col_btn3:
-        btn_multi = st.button("Traducir Palabra", key="btn_multi", use_container_width=True)
-    
-    st.markdown('</div></div>', unsafe_allow_html=True)
-
-    # Lógica de los botones
-    if btn_multi:
-        palabra = texto_entrada.strip().split()[0] if texto_entrada.strip() else ""
-        if not palabra:
-            st.warning("Por favor, ingresa una palabra para ver sus traducciones.")
-            st.session_state["traduccion"] = ""
-        else:
-            traducciones = buscar_todas_traducciones(palabra)
-            if traducciones:
-                st.session_state["traduccion"] = ", ".join(traducciones)
-            else:
-                st.session_state["traduccion"] = ""
-                st.warning("No se encontraron traducciones para esa palabra.")
-
-    if btn_traducir:
-        if texto_entrada.strip() == "":
-            st.warning("Por favor, ingresa una oración para traducir.")
-            st.session_state["traduccion"] = ""
-        elif len(texto_entrada.strip().split()) < 2:
-            st.warning("La oración debe tener al menos un sujeto y un verbo.")
-            st.session_state["traduccion"] = ""
-        else:
-            st.session_state["last_input_time"] = time.time()
-            try:
-                traduccion = traducir_oracion(texto_entrada)
-                st.session_state["traduccion"] = traduccion
-            except Exception as e:
-                st.warning(f"Ocurrió un error inesperado: {str(e)}")
-                st.session_state["traduccion"] = ""
-
-    # Container de traducción modernizado - SIEMPRE VISIBLE
-    traduccion = st.session_state.get("traduccion", "")
-    
-    st.markdown('<div class="input-container fade-in">', unsafe_allow_html=True)
-    st.markdown('<div class="input-label">🌍 Traducción en Kichwa</div>', unsafe_allow_html=True)
-    
-    # Mostrar placeholder si no hay traducción
-    placeholder_text = "La traducción aparecerá aquí..." if not traduccion else ""
-    
-    st.text_area(
-        label="Área de texto para traducción",
-        value=traduccion,
-        height=100,
-        key="traduccion_area",
-        disabled=True,
-        placeholder=placeholder_text,
-        label_visibility="collapsed"
-    )
-    
-    # Botón de audio modernizado
-    if traduccion:
-        st.markdown('<div class="button-grid">', unsafe_allow_html=True)
-        # Botón personalizado con la misma lógica CSS que los otros botones
-        audio_button_html = f'''
-        <div class="stButton">
-            <button onclick="playAudio()" style="width: 100%;">
-                Escuchar Pronunciación
-            </button>
-        </div>
-        <script>
-        function playAudio() {{
-            // Crear elemento de audio y reproducir
-            const audio = new Audio('data:audio/mp3;base64,{base64.b64encode(text_to_audio(traduccion)).decode()}');
-            audio.play();
-        }}
-        </script>
-        '''
-        st.markdown(audio_button_html, unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # Auto-refresh lógica
-    if st.session_state["texto_entrada"].strip() != "" and time.time() - st.session_state["last_input_time"] <= 3:
-        st.rerun()
+    # Solo el panel se vuelve a ejecutar al escribir o pulsar sus botones; lo de arriba se dibuja una vez
+    panel_traduccion(al_pulsar_voz=speech_to_text)
 
 with col_der:
     # ========================================
@@ -700,10 +589,8 @@ with col_der:
         
         if os.path.exists(imagen_path):
             try:
-                img = Image.open(imagen_path)
-                # Redimensionar manteniendo la proporción
-                img = img.resize((150, 200), Image.Resampling.LANCZOS)
-                st.image(img, width=150)
+                # Decodificada y redimensionada una sola vez por proceso (utils/imagenes.py)
+                st.image(imagen_redimensionada(imagen_path, 150, 200), width=150)
             except Exception as e:
                 # Fallback si hay error cargando la imagen específica
                 st.markdown(f'''
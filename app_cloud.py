@@ -2,10 +2,10 @@ import streamlit as st
 import os
 import base64
 import sys
-import time 
 
-from traductor_kichwa.main import traducir_oracion, normalizar_texto
-from PIL import Image
+from traductor_kichwa.traduccion import normalizar_texto
+from traductor_kichwa.interfaz import iniciar_estado, panel_traduccion_nube
+from traductor_kichwa.utils.imagenes import imagen_redimensionada
 from streamlit.components.v1 import html
 
 # Ruta de imágenes
@@ -178,28 +178,17 @@ label[data-testid="stMarkdownContainer"] > div, .stTextArea label {
 # Layout con imágenes a los costados
 col_izq, col_centro, col_der = st.columns([0.5, 7, 0.5])
 
+# Borde decorativo: se decodifica una vez por proceso y, si el archivo no está, se omite
+borde = imagen_redimensionada(os.path.join(IMGS_PATH, 'borde_v1.png'), 200, 400)
+
 with col_izq:
-    img_izq1 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq1)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
+    if borde:
+        for _ in range(5):
+            st.image(borde)
 
 
 with col_centro:
-    # Inicializar variables de sesión si no existen
-    if "texto_entrada" not in st.session_state:
-        st.session_state["texto_entrada"] = ""
-    if "traduccion" not in st.session_state:
-        st.session_state["traduccion"] = ""
-    if "last_input_time" not in st.session_state:
-        st.session_state["last_input_time"] = 0
+    iniciar_estado()
     # Título centrado
     st.markdown(f'<div class="titulo-principal" style="display:table; margin:0 auto;">{titulo}</div>', unsafe_allow_html=True)
     # Subtítulo
@@ -227,64 +216,15 @@ with col_centro:
     </div>
     ''', unsafe_allow_html=True)
 
-    # Cuadro de entrada de texto y botones juntos, usando Streamlit y CSS mejorado
-    st.markdown('<div style="max-width:400px; margin:0 auto;">', unsafe_allow_html=True)
-    texto_entrada = st.text_area(
-        "Ingresa el texto a traducir:",
-        value=st.session_state["texto_entrada"],
-        height=80,
-        max_chars=500,
-        placeholder="Escribe aquí tu texto...",
-        key="texto_entrada_area"
-    )
-    col_btn_trad, col_btn_voz = st.columns([1, 1], gap="small")
-    with col_btn_trad:
-        btn_traducir = st.button("🔄 Traducir", key="btn_traducir", use_container_width=True)
-    with col_btn_voz:
-        btn_voz = st.button("🎤 Escuchar y transcribir voz", key="btn_voz", use_container_width=True)
-    if btn_traducir:
-        if texto_entrada.strip() == "":
-            st.warning("Por favor, ingresa una oración para traducir.")
-        elif len(texto_entrada.strip().split()) < 2:
-            st.warning("La oración debe tener al menos un sujeto y un verbo.")
-        else:
-            st.session_state["last_input_time"] = time.time()
-            try:
-                traduccion = traducir_oracion(texto_entrada)
-                st.session_state["traduccion"] = traduccion
-            except Exception as e:
-                st.warning(f"Ocurrió un error inesperado: {str(e)}")
-                st.session_state["traduccion"] = ""
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # Cuadro de traducción alineado y centrado
-    traduccion = st.session_state["traduccion"] if "traduccion" in st.session_state else ""
-    st.markdown('<div style="max-width:400px; margin:0 auto;">', unsafe_allow_html=True)
-    st.text_area(
-        "Traducción:",
-        value=traduccion,
-        height=80,
-        key="traduccion_area",
-        disabled=True
-    )
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Solo el panel se vuelve a ejecutar al escribir o pulsar sus botones; lo de arriba se dibuja una vez
+    panel_traduccion_nube()
 
 
-    # Refrescar la app automáticamente si está esperando traducir
-    if st.session_state["texto_entrada"].strip() != "" and time.time() - st.session_state["last_input_time"] <= 3:
-        st.rerun()
-
 with col_der:
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
-    img_izq2 = Image.open(os.path.join(IMGS_PATH, 'borde_v1.png')).resize((200, 400))
-    st.image(img_izq2)
+    if borde:
+        for _ in range(5):
+            st.image(borde)
+
 
 
 
@@ -0,0 +1,130 @@
+# benchmarks/extremo_a_extremo.py
+"""
+Benchmark de extremo a extremo con un corpus de referencia versionado
+(benchmarks/corpus_oro_v*.jsonl): pasa cada oración por traducir_oracion o
+traducir_futuro_inmediato y, en una sola ejecución, informa oraciones/segundo,
+latencias p50/p95/p99, consultas a la BD por oración y aciertos exactos.
+
+    python -m benchmarks.extremo_a_extremo                     # fixture SQLite, sin cachés
+    python -m benchmarks.extremo_a_extremo --cache             # con la caché de traducciones
+    python -m benchmarks.extremo_a_extremo --lexico memoria    # léxico en memoria
+    python -m benchmarks.extremo_a_extremo --bd --corpus mi_corpus.jsonl   # BD configurada
+
+Cada línea del corpus es {"id", "entrada", "esperado"} o, si la oración debe
+fallar, {"id", "entrada", "error"}. Sale con código 1 si alguna salida no coincide.
+Por defecto usa el léxico de benchmarks/fixture.py, así que corre en un portátil sin MySQL.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture import preparar_fixture
+from traductor_kichwa.db import consultas
+from traductor_kichwa.db.artefacto import compilar_artefacto
+from traductor_kichwa.db.backend import obtener_backend
+from traductor_kichwa.db.lexico import desactivar_lexico
+from traductor_kichwa.traduccion import (es_futuro_inmediato, limpiar_cache, traducir_futuro_inmediato,
+                                         traducir_oracion)
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_oro_v1.jsonl")
+
+def leer_corpus(ruta: str) -> list[dict]:
+    with open(ruta, encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+def percentil(ordenados: list[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    i = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[i]
+
+def traducir(entrada: str) -> tuple:
+    """(salida, error) tal como lo vería el usuario."""
+    try:
+        if es_futuro_inmediato(entrada):
+            return traducir_futuro_inmediato(entrada), None
+        return traducir_oracion(entrada), None
+    except ValueError as e:
+        return None, str(e)
+
+def preparar_lexico(modo: str):
+    if modo == "memoria":
+        consultas.activar_lexico_memoria()
+    elif modo == "artefacto":
+        ruta = os.path.join(tempfile.gettempdir(), "traductor_kichwa_benchmark.kxlex")
+        compilar_artefacto(consultas.cargar_lexico(), ruta)
+        consultas.activar_artefacto(ruta)
+
+def ejecutar(corpus: list[dict], repeticiones: int, con_cache: bool) -> dict:
+    # calentamiento: autómata de frases, formas compuestas, conexiones
+    for caso in corpus:
+        traducir(caso["entrada"])
+
+    latencias, fallos = [], {}
+    consultas_antes = obtener_backend().estadisticas()["consultas"]
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for caso in corpus:
+            if not con_cache:
+                limpiar_cache()
+                consultas._olvidar_memos()
+            t0 = time.perf_counter()
+            salida, error = traducir(caso["entrada"])
+            latencias.append(time.perf_counter() - t0)
+            if (salida, error) != (caso.get("esperado"), caso.get("error")):
+                fallos[caso["id"]] = {"entrada": caso["entrada"], "esperado": caso.get("esperado", caso.get("error")),
+                                      "obtenido": salida if error is None else error}
+    total = time.perf_counter() - inicio
+    n = len(latencias)
+    n_consultas = obtener_backend().estadisticas()["consultas"] - consultas_antes
+
+    latencias.sort()
+    return {
+        "oraciones":            n,
+        "oraciones_seg":        n / total if total else 0.0,
+        "p50_ms":               percentil(latencias, 50) * 1000,
+        "p95_ms":               percentil(latencias, 95) * 1000,
+        "p99_ms":               percentil(latencias, 99) * 1000,
+        "consultas_por_oracion": n_consultas / n if n else 0.0,
+        "aciertos":             (len(corpus) - len(fallos)) / len(corpus) if corpus else 1.0,
+        "fallos":               fallos,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", default=CORPUS, help="corpus JSONL de referencia")
+    parser.add_argument("-n", "--repeticiones", type=int, default=20, help="pasadas completas por el corpus")
+    parser.add_argument("--lexico", choices=("consultas", "memoria", "artefacto"), default="consultas",
+                        help="de dónde leen las búsquedas: la BD, el léxico en memoria o un artefacto mmap")
+    parser.add_argument("--cache", action="store_true",
+                        help="dejar activas la caché de traducciones y los memos (por defecto se vacían en cada oración)")
+    parser.add_argument("--bd", action="store_true", help="usar la BD configurada en vez del léxico de prueba")
+    parser.add_argument("--json", action="store_true", help="imprimir el informe como JSON")
+    args = parser.parse_args(argv)
+
+    if not args.bd:
+        preparar_fixture()
+    preparar_lexico(args.lexico)
+    try:
+        informe = ejecutar(leer_corpus(args.corpus), args.repeticiones, args.cache)
+    finally:
+        desactivar_lexico()
+
+    if args.json:
+        print(json.dumps(informe, indent=2, ensure_ascii=False))
+    else:
+        print(f"corpus:       {os.path.basename(args.corpus)} ({informe['oraciones']} traducciones)")
+        print(f"rendimiento:  {informe['oraciones_seg']:,.0f} oraciones/s")
+        print(f"latencia:     p50 {informe['p50_ms']:.3f} ms  p95 {informe['p95_ms']:.3f} ms  p99 {informe['p99_ms']:.3f} ms")
+        print(f"consultas BD: {informe['consultas_por_oracion']:.2f} por oración")
+        print(f"aciertos:     {informe['aciertos']:.1%}")
+        for id_caso, f in informe["fallos"].items():
+            print(f"DIFERENCIA {id_caso}: {f['entrada']!r}: esperado {f['esperado']!r}, obtenido {f['obtenido']!r}")
+    return 1 if informe["fallos"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# benchmarks/fixture.py
+"""
+Léxico de prueba para los benchmarks: unas cuantas entradas reales del traductor
+más relleno sintético (determinista) para que las tablas tengan un tamaño creíble.
+Se vuelca a un SQLite local con el mismo esquema que db/exportar_sqlite.py, así
+que no hace falta ningún servidor MySQL.
+"""
+import os
+import tempfile
+
+from traductor_kichwa.db.backend import BackendSQLite, usar_backend
+from traductor_kichwa.db.exportar_sqlite import crear_sqlite
+from traductor_kichwa.db.lexico import desactivar_lexico
+
+RELLENO = 3000   # palabras sintéticas extra en palabra_es/palabra_ki
+
+PERSONAS = [
+    (1, "yo", "ñuka", "singular"),
+    (2, "tú", "kan", "singular"),
+    (3, "él", "pay", "singular"),
+    (4, "ella", "pay", "singular"),
+    (5, "nosotros", "ñukanchik", "plural"),
+    (6, "ustedes", "kankuna", "plural"),
+    (7, "ellos", "paykuna", "plural"),
+]
+
+# verbo -> (raíz kichwa, formas por persona: presente, pasado, futuro, gerundio)
+VERBOS = {
+    "comer":    ("miku",    ["como", "comes", "come", "come", "comemos", "comen", "comen"],
+                            ["comí", "comiste", "comió", "comió", "comimos", "comieron", "comieron"],
+                            ["comeré", "comerás", "comerá", "comerá", "comeremos", "comerán", "comerán"], "comiendo"),
+    "jugar":    ("puklla",  ["juego", "juegas", "juega", "juega", "jugamos", "juegan", "juegan"],
+                            ["jugué", "jugaste", "jugó", "jugó", "jugamos", "jugaron", "jugaron"],
+                            ["jugaré", "jugarás", "jugará", "jugará", "jugaremos", "jugarán", "jugarán"], "jugando"),
+    "ir":       ("ri",      ["voy", "vas", "va", "va", "vamos", "van", "van"],
+                            ["fui", "fuiste", "fue", "fue", "fuimos", "fueron", "fueron"],
+                            ["iré", "irás", "irá", "irá", "iremos", "irán", "irán"], "yendo"),
+    "estudiar": ("yacha",   ["estudio", "estudias", "estudia", "estudia", "estudiamos", "estudian", "estudian"],
+                            ["estudié", "estudiaste", "estudió", "estudió", "estudiamos", "estudiaron", "estudiaron"],
+                            ["estudiaré", "estudiarás", "estudiará", "estudiará", "estudiaremos", "estudiarán", "estudiarán"], "estudiando"),
+    "cocinar":  ("yanu",    ["cocino", "cocinas", "cocina", "cocina", "cocinamos", "cocinan", "cocinan"],
+                            ["cociné", "cocinaste", "cocinó", "cocinó", "cocinamos", "cocinaron", "cocinaron"],
+                            ["cocinaré", "cocinarás", "cocinará", "cocinará", "cocinaremos", "cocinarán", "cocinarán"], "cocinando"),
+    "vivir":    ("kawsa",   ["vivo", "vives", "vive", "vive", "vivimos", "viven", "viven"],
+                            ["viví", "viviste", "vivió", "vivió", "vivimos", "vivieron", "vivieron"],
+                            ["viviré", "vivirás", "vivirá", "vivirá", "viviremos", "vivirán", "vivirán"], "viviendo"),
+}
+ESTAR = ["estoy", "estás", "está", "está", "estamos", "están", "están"]
+# sufijos kichwa por persona: presente, pasado, futuro
+SUFIJOS = [("ni", "rkani", "sha"), ("nki", "rkanki", "nki"), ("n", "rka", "nka"), ("n", "rka", "nka"),
+           ("nchik", "rkanchik", "shun"), ("nkichik", "rkankichik", "nkichik"), ("nkuna", "rkakuna", "nkakuna")]
+
+PALABRAS = [
+    ("pan", "tanta"), ("casa", "wasi"), ("comer", "mikuy"), ("amigos", "mashikuna"),
+    ("familia", "ayllu"), ("familia", "ayllukuna"), ("universidad", "hatun yachana wasi"),
+    ("agua", "yaku"), ("escuela", "yachana wasi"), ("mama", "mama"), ("papa", "tayta"),
+    ("perro", "allku"), ("gato", "misi"), ("maiz", "sara"), ("papas", "papakuna"),
+    ("comida", "mikuna"), ("libro", "kamu"), ("montaña", "urku"), ("rio", "mayu"),
+    ("sol", "inti"), ("luna", "killa"), ("hoy", "kunan"), ("mañana", "kaya"),
+    ("jugar", "pukllay"), ("estudiar", "yachakuy"), ("mis", "ñukapak"), ("su", "paypak"),
+]
+
+# frase_es -> (forma, tipo)
+MORFEMAS = {
+    "en": ("pi", "ubicacion"), "en la": ("pi", "ubicacion"), "en el": ("pi", "ubicacion"),
+    "a": ("man", "direccion"), "a la": ("man", "direccion"), "al": ("man", "direccion"),
+    "hacia": ("man", "direccion"), "con": ("wan", "compania"), "con su": ("wan", "compania"),
+    "con mis": ("wan", "compania"), "de": ("manta", "origen"), "desde": ("manta", "origen"),
+    "hasta": ("kaman", "tiempo/espacio"), "hasta la": ("kaman", "tiempo/espacio"),
+    "para": ("pak", "dativo"), "por": ("rayku", "causa"), "por la": ("rayku", "causa"),
+}
+
+MODOS = [("pregunta", "chu", "despues_verbo"), ("negacion", "chu", "despues_verbo")]
+
+def datos_fixture():
+    """Tablas del léxico de prueba como {tabla: (columnas, filas)}."""
+    conj = []
+    for raiz, pres, pas, fut, ger in VERBOS.values():
+        for i, (pid, *_r) in enumerate(PERSONAS):
+            s_pres, s_pas, s_fut = SUFIJOS[i]
+            conj.append((len(conj) + 1, pid,
+                         pres[i], raiz + s_pres, pas[i], raiz + s_pas, fut[i], raiz + s_fut,
+                         f"{ESTAR[i]} {ger}", raiz + "ku" + s_pres))
+
+    palabras = list(PALABRAS) + [(f"palabra{i}", f"shimi{i}") for i in range(RELLENO)]
+    lemas = {}
+    for lema, _ in palabras:
+        lemas.setdefault(lema, len(lemas) + 1)
+    morfemas = {}
+    for forma, tipo in MORFEMAS.values():
+        morfemas.setdefault((forma, tipo), len(morfemas) + 1)
+
+    return {
+        "persona": (["id", "pronombre_es", "pronombre_ki", "numero"], PERSONAS),
+        "conjugacion_ki": (["id", "persona_id",
+                            "verbo_conjugado_es", "verbo_conjugado",
+                            "verbo_conjugado_pasado_es", "verbo_conjugado_pasado",
+                            "verbo_conjugado_futuro_es", "verbo_conjugado_futuro",
+                            "verbo_continuo_es", "verbo_continuo"], conj),
+        "palabra_es": (["id", "lema"], [(i, lema) for lema, i in lemas.items()]),
+        "palabra_ki": (["id", "raiz"], [(i + 1, raiz) for i, (_, raiz) in enumerate(palabras)]),
+        "traduccion": (["id", "palabra_es_id", "palabra_ki_id"],
+                       [(i + 1, lemas[lema], i + 1) for i, (lema, _) in enumerate(palabras)]),
+        "morfema": (["id", "forma", "tipo", "modo_aplicacion", "elemento_a_eliminar"],
+                    [(i, forma, tipo, "sufijo", None) for (forma, tipo), i in morfemas.items()]),
+        "traduccion_morfema": (["id", "frase_es", "morfema_id"],
+                               [(i + 1, frase, morfemas[par]) for i, (frase, par) in enumerate(MORFEMAS.items())]),
+        "modo_oracional": (["id", "tipo", "marcador", "posicion"],
+                           [(i + 1, *m) for i, m in enumerate(MODOS)]),
+    }
+
+def preparar_fixture(ruta: str = None) -> str:
+    """Crea el SQLite de prueba y deja el traductor usándolo (sin léxico en memoria)."""
+    if ruta is None:
+        ruta = os.path.join(tempfile.gettempdir(), "traductor_kichwa_fixture.sqlite3")
+    crear_sqlite(ruta, datos_fixture())
+    usar_backend(BackendSQLite(ruta))
+    desactivar_lexico()
+    return ruta
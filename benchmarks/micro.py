@@ -0,0 +1,166 @@
+# benchmarks/micro.py
+"""
+Microbenchmarks del tokenizador, la capa de consultas y el ensamblador, contra el
+léxico de prueba de benchmarks/fixture.py (SQLite local, sin MySQL).
+
+    python -m benchmarks.micro                  # compara con la línea base
+    python -m benchmarks.micro --guardar        # reescribe la línea base
+    python -m benchmarks.micro --umbral 0.3 -k consultas   # umbral más estricto en una máquina dedicada
+
+Para cada caso informa operaciones/segundo y memoria asignada por operación
+(pico de tracemalloc). Sale con código 1 si algún caso es más lento, o asigna
+más memoria, que la línea base en más del umbral.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fixture import preparar_fixture
+from traductor_kichwa.db import consultas
+from traductor_kichwa.db.ensamblador import construir_oracion_kichwa
+from traductor_kichwa.db.lexico import desactivar_lexico
+from traductor_kichwa.traduccion import construir_complemento, preparar_tokens
+from traductor_kichwa.utils.tokenizer import normalizar_texto, tokenizar_oracion, agrupar_ngramas
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base_micro.json")
+
+ORACION = "¿Nosotros estamos jugando con mis amigos en la casa de la montaña hasta la noche?"
+NORMALIZADA = normalizar_texto(ORACION)
+TOKENS = tokenizar_oracion(NORMALIZADA)
+PALABRAS = ["pan", "casa", "familia", "palabra1500", "desconocida", "montaña", "noche", "xyz"]
+FRASES = ["en la", "con", "hasta la", "de", "la", "noche", "con mis", "zz"]
+VERBOS = [("juego", 1), ("jugamos", 5), ("estamos jugando", 5), ("comerán", 7), ("pan", 1), ("casa", 3)]
+PARTES = {"sujeto": "ñukanchik", "complemento": ["mashikunawan", "wasipi"], "preverb": ["urkukaman"],
+          "verbo": "pukllakunchik chu"}
+
+def _ciclo(valores):
+    """Función que devuelve el siguiente valor de la lista en cada llamada."""
+    estado = {"i": 0}
+    def siguiente():
+        v = valores[estado["i"] % len(valores)]
+        estado["i"] += 1
+        return v
+    return siguiente
+
+def casos_base():
+    palabra, frase, verbo = _ciclo(PALABRAS), _ciclo(FRASES), _ciclo(VERBOS)
+    agrupados = agrupar_ngramas(TOKENS)
+    return {
+        "tokenizer.normalizar_texto":  lambda: normalizar_texto(ORACION),
+        "tokenizer.tokenizar_oracion": lambda: tokenizar_oracion(NORMALIZADA),
+        "tokenizer.agrupar_ngramas":   lambda: agrupar_ngramas(TOKENS),
+        "main.preparar_tokens":        lambda: preparar_tokens(ORACION),
+        "consultas.buscar_pronombre_es":          lambda: consultas.buscar_pronombre_es("nosotros"),
+        "consultas.buscar_conjugacion_con_tiempo": lambda: consultas.buscar_conjugacion_con_tiempo(*verbo()),
+        "consultas.buscar_conjugacion_auto":      lambda: consultas.buscar_conjugacion_auto(*verbo()),
+        "consultas.buscar_traduccion_palabra":    lambda: consultas.buscar_traduccion_palabra(palabra()),
+        "consultas.buscar_todas_traducciones":    lambda: consultas.buscar_todas_traducciones(palabra()),
+        "consultas.buscar_morfema_desde_frase":   lambda: consultas.buscar_morfema_desde_frase(frase()),
+        "consultas.obtener_marcadores_modo":      lambda: consultas.obtener_marcadores_modo("pregunta"),
+        "consultas.obtener_formas_verbales_compuestas": consultas.obtener_formas_verbales_compuestas,
+        "consultas.obtener_frases_morfema":       consultas.obtener_frases_morfema,
+        "consultas.resolver_claves":              lambda: consultas.resolver_claves(agrupados),
+        # como en traducir_oracion: las claves de la oración se resuelven de golpe y el complemento lee de ahí
+        "main.construir_complemento":             lambda: construir_complemento(agrupados[1:], consultas.resolver_claves(agrupados)),
+        "ensamblador.construir_oracion_kichwa":   lambda: construir_oracion_kichwa(PARTES),
+    }
+
+def casos():
+    """Los mismos casos contra SQLite y, para la capa de consultas, también con el léxico en memoria."""
+    preparar_fixture()
+    resultado = {f"{k} (sqlite)" if k.startswith("consultas.") else k: v for k, v in casos_base().items()}
+    resultado["consultas.cargar_lexico (sqlite)"] = consultas.cargar_lexico
+    return resultado
+
+def casos_memoria():
+    consultas.activar_lexico_memoria()
+    return {f"{k} (memoria)": v for k, v in casos_base().items()
+            if k.startswith("consultas.") or k == "main.construir_complemento"}
+
+def medir(funcion, tiempo_min: float = 0.2, repeticiones: int = 5) -> dict:
+    funcion()   # calentamiento (cachés, autómata, conexiones)
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        if time.perf_counter() - t0 >= tiempo_min / 4:
+            break
+        n *= 2
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - t0) / n)
+
+    tracemalloc.start()
+    muestras = min(n, 200)
+    pico_total = 0
+    for _ in range(muestras):
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        funcion()
+        pico_total += tracemalloc.get_traced_memory()[1] - antes
+    tracemalloc.stop()
+    return {"ops_seg": 1.0 / mejor, "bytes_op": pico_total / muestras}
+
+def regresiones_de(nombre: str, r: dict, b: dict, umbral: float) -> list[str]:
+    if not b:
+        return []
+    regresiones = []
+    if r["ops_seg"] < b["ops_seg"] * (1 - umbral):
+        regresiones.append(f"{nombre}: {r['ops_seg']:.0f} ops/s frente a {b['ops_seg']:.0f} de la línea base")
+    # margen fijo de 256 bytes para que los casos que casi no asignan no salten por ruido
+    if r["bytes_op"] > b["bytes_op"] * (1 + umbral) + 256:
+        regresiones.append(f"{nombre}: {r['bytes_op']:.0f} B/op frente a {b['bytes_op']:.0f} de la línea base")
+    return regresiones
+
+def medir_contra(funcion, b: dict, umbral: float, reintentos: int = 2) -> dict:
+    """Mide; si parece una regresión vuelve a medir (el ruido de la máquina es frecuente) y se queda con lo mejor."""
+    r = medir(funcion)
+    while reintentos and regresiones_de("", r, b, umbral):
+        otra = medir(funcion)
+        r = {"ops_seg": max(r["ops_seg"], otra["ops_seg"]), "bytes_op": min(r["bytes_op"], otra["bytes_op"])}
+        reintentos -= 1
+    return r
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--guardar", action="store_true", help="guardar los resultados como nueva línea base")
+    parser.add_argument("--umbral", type=float, default=0.5, help="regresión tolerada (0.5 = 50%%; las máquinas compartidas son ruidosas)")
+    parser.add_argument("--linea-base", default=LINEA_BASE)
+    parser.add_argument("-k", dest="filtro", default="", help="solo los casos cuyo nombre contenga este texto")
+    args = parser.parse_args(argv)
+
+    base = {}
+    if not args.guardar and os.path.exists(args.linea_base):
+        with open(args.linea_base, encoding="utf-8") as f:
+            base = json.load(f)
+
+    resultados, regresiones = {}, []
+    for grupo in (casos, casos_memoria):
+        for nombre, funcion in grupo().items():
+            if args.filtro not in nombre:
+                continue
+            r = resultados[nombre] = medir_contra(funcion, base.get(nombre), args.umbral)
+            print(f"{nombre:<60} {r['ops_seg']:>14,.0f} ops/s {r['bytes_op']:>10,.0f} B/op")
+            regresiones.extend(regresiones_de(nombre, r, base.get(nombre), args.umbral))
+    desactivar_lexico()
+
+    if args.guardar:
+        with open(args.linea_base, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"Línea base guardada en {args.linea_base}")
+        return 0
+    if not base:
+        print("No hay línea base; usa --guardar para crearla.")
+    for r in regresiones:
+        print("REGRESIÓN:", r)
+    return 1 if regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,35 @@
-import mysql.connector
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from traductor_kichwa.utils.traza import contar
+
+try:
+    import mysql.connector
+    _HAS_MYSQL = True
+except ImportError:   # con el backend SQLite no hace falta el conector de MySQL
+    _HAS_MYSQL = False
+
+# Backend de datos: "mysql" (servidor) o "sqlite" (archivo embebido, ver db/exportar_sqlite.py)
+BACKEND     = os.environ.get("TRADUCTOR_BACKEND", "mysql")
+SQLITE_RUTA = os.environ.get(
+    "TRADUCTOR_SQLITE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "traductorfinal.sqlite3"),
+)
+# Léxico precompilado (db/artefacto.py); si se define, las búsquedas leen de ese archivo
+ARTEFACTO_RUTA = os.environ.get("TRADUCTOR_ARTEFACTO", "")
+
+# Parámetros del pool (se pueden cambiar con variables de entorno)
+POOL_TAMANO   = int(os.environ.get("TRADUCTOR_POOL_TAMANO", "5"))      # conexiones máximas abiertas
+POOL_ESPERA   = float(os.environ.get("TRADUCTOR_POOL_ESPERA", "10"))   # segundos esperando una conexión libre
+POOL_RECICLAR = float(os.environ.get("TRADUCTOR_POOL_RECICLAR", "300"))  # segundos ociosa antes de cerrarla
+POOL_PING     = float(os.environ.get("TRADUCTOR_POOL_PING", "30"))     # segundos ociosa antes de comprobarla con un ping
 
 def conectar_bd():
+    if not _HAS_MYSQL:
+        raise ImportError("Falta mysql-connector-python (pip install mysql-connector-python) o usa TRADUCTOR_BACKEND=sqlite.")
     return mysql.connector.connect(
         host="localhost",
         port=3308,
@@ -8,5 +37,118 @@ def conectar_bd():
         password="",
         database="traductorfinal",
         charset="utf8mb4",
-        use_unicode=True
+        use_unicode=True,
+        # solo se lee: sin autocommit cada conexión del pool quedaría en una transacción
+        # REPEATABLE READ abierta para siempre, viendo la misma foto de la BD
+        autocommit=True,
     )
+
+class PoolConexiones:
+    """
+    Pool acotado y seguro entre hilos:
+    - Nunca hay más de `tamano` conexiones abiertas a la vez.
+    - Una conexión ociosa más de `ping` segundos se comprueba (is_connected hace un
+      ping al servidor) antes de entregarla; las recién devueltas se entregan tal cual.
+    - Las conexiones ociosas más de `reciclar` segundos se cierran y se abren de nuevo.
+    """
+    def __init__(self, fabrica=conectar_bd, tamano: int = POOL_TAMANO,
+                 espera: float = POOL_ESPERA, reciclar: float = POOL_RECICLAR, ping: float = POOL_PING):
+        if tamano < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1.")
+        self.fabrica  = fabrica
+        self.tamano   = tamano
+        self.espera   = espera
+        self.reciclar = reciclar
+        self.ping     = ping
+        self._libres  = deque()          # (conexion, instante en que se devolvió)
+        self._cupos   = threading.BoundedSemaphore(tamano)
+        self._lock    = threading.Lock()
+        self._abiertas = 0
+
+    def _sana(self, conn, devuelta: float) -> bool:
+        ociosa = time.monotonic() - devuelta
+        if self.reciclar and ociosa > self.reciclar:
+            return False
+        if ociosa <= self.ping:
+            return True
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    def _cerrar(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._abiertas -= 1
+
+    def obtener(self):
+        if not self._cupos.acquire(timeout=self.espera):
+            raise TimeoutError(f"No hay conexiones libres tras {self.espera}s (pool de {self.tamano}).")
+        try:
+            while True:
+                with self._lock:
+                    item = self._libres.pop() if self._libres else None
+                if item is None:
+                    break
+                conn, devuelta = item
+                if self._sana(conn, devuelta):
+                    return conn
+                self._cerrar(conn)
+            conn = self.fabrica()
+            contar("conexiones")
+            with self._lock:
+                self._abiertas += 1
+            return conn
+        except BaseException:
+            self._cupos.release()
+            raise
+
+    def devolver(self, conn, descartar: bool = False):
+        try:
+            if descartar:
+                self._cerrar(conn)
+            else:
+                with self._lock:
+                    self._libres.append((conn, time.monotonic()))
+        finally:
+            self._cupos.release()
+
+    @contextmanager
+    def conexion(self):
+        conn = self.obtener()
+        try:
+            yield conn
+        except BaseException:
+            # si algo falló a mitad de consulta, no reutilizamos la conexión
+            self.devolver(conn, descartar=True)
+            raise
+        self.devolver(conn)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {"tamano": self.tamano, "abiertas": self._abiertas, "libres": len(self._libres)}
+
+    def cerrar(self):
+        with self._lock:
+            libres, self._libres = list(self._libres), deque()
+        for conn, _ in libres:
+            self._cerrar(conn)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def obtener_pool() -> PoolConexiones:
+    """Pool único del proceso, compartido por todas las sesiones de Streamlit."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexiones()
+    return _pool
+
+def obtener_conexion():
+    """Uso: `with obtener_conexion() as conn: ...` — la conexión vuelve sola al pool."""
+    return obtener_pool().conexion()
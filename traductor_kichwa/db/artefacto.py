@@ -0,0 +1,180 @@
+# db/artefacto.py
+"""
+Léxico precompilado en un archivo binario que se abre con mmap: todos los procesos
+que lo abren comparten la misma copia en la caché de páginas y arrancan en
+milisegundos, sin leer la BD.
+
+    python -m traductor_kichwa.db.artefacto [destino.kxlex]
+
+Formato (enteros little-endian):
+    cabecera   MAGIA(8) | version u32 | n_tablas u32 | sha256 del contenido (32)
+    directorio n_tablas × (nombre 16 bytes | desplazamiento u64 | largo u64)
+    tabla      N u32 | offsets de claves (N+1)×u32 | offsets de valores (N+1)×u32
+               | claves utf-8 ordenadas | valores JSON utf-8
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Optional, List, Dict, Iterator, Set, Tuple
+
+from traductor_kichwa.db.lexico import Lexico, clave_busqueda
+
+MAGIA = b"KICHLEX\x00"
+VERSION_FORMATO = 1
+_CABECERA = struct.Struct("<8sII32s")
+_ENTRADA  = struct.Struct("<16sQQ")
+_U32      = struct.Struct("<I")
+_SEP      = "\x1f"   # separa verbo y persona_id en las claves de conjugaciones
+
+def _tabla_binaria(pares: Dict[str, object]) -> bytes:
+    items = sorted((k.encode("utf-8"), json.dumps(v, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                   for k, v in pares.items())
+    off_claves, off_valores = [0], [0]
+    for clave, valor in items:
+        off_claves.append(off_claves[-1] + len(clave))
+        off_valores.append(off_valores[-1] + len(valor))
+    n = len(items)
+    return b"".join([
+        _U32.pack(n),
+        struct.pack(f"<{n + 1}I", *off_claves),
+        struct.pack(f"<{n + 1}I", *off_valores),
+        b"".join(c for c, _ in items),
+        b"".join(v for _, v in items),
+    ])
+
+def compilar_artefacto(lex: Lexico, destino: str) -> str:
+    """Escribe el léxico en `destino` (de forma atómica) y devuelve su checksum sha256."""
+    tablas = {
+        "pronombres":    lex.pronombres,
+        "conjugaciones": {f"{verbo}{_SEP}{pid}": list(v) for (verbo, pid), v in lex.conjugaciones.items()},
+        "compuestas":    {forma: 1 for forma in lex.formas_compuestas},
+        "traducciones":  lex.traducciones,
+        "morfemas":      lex.morfemas,
+        "modos":         lex.modos,
+    }
+    cuerpos = [(nombre, _tabla_binaria(pares)) for nombre, pares in tablas.items()]
+    inicio = _CABECERA.size + _ENTRADA.size * len(cuerpos)
+    directorio, posicion = [], inicio
+    for nombre, cuerpo in cuerpos:
+        directorio.append(_ENTRADA.pack(nombre.encode("ascii"), posicion, len(cuerpo)))
+        posicion += len(cuerpo)
+    contenido = b"".join(directorio) + b"".join(c for _, c in cuerpos)
+    checksum = hashlib.sha256(contenido).digest()
+
+    carpeta = os.path.dirname(os.path.abspath(destino))
+    fd, temporal = tempfile.mkstemp(suffix=".kxlex", dir=carpeta)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_CABECERA.pack(MAGIA, VERSION_FORMATO, len(cuerpos), checksum))
+            f.write(contenido)
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, destino)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return checksum.hex()
+
+class _TablaOrdenada:
+    """Búsqueda binaria sobre una tabla del archivo, leyendo directamente del mmap."""
+    def __init__(self, mm: mmap.mmap, base: int):
+        self.mm = mm
+        self.n = _U32.unpack_from(mm, base)[0]
+        self.off_claves  = base + 4
+        self.off_valores = self.off_claves + 4 * (self.n + 1)
+        self.blob_claves = self.off_valores + 4 * (self.n + 1)
+        self.blob_valores = self.blob_claves + _U32.unpack_from(mm, self.off_claves + 4 * self.n)[0]
+
+    def _clave(self, i: int) -> bytes:
+        a, b = struct.unpack_from("<II", self.mm, self.off_claves + 4 * i)
+        return self.mm[self.blob_claves + a:self.blob_claves + b]
+
+    def _valor(self, i: int):
+        a, b = struct.unpack_from("<II", self.mm, self.off_valores + 4 * i)
+        return json.loads(self.mm[self.blob_valores + a:self.blob_valores + b])
+
+    def buscar(self, clave: str):
+        objetivo = clave.encode("utf-8")
+        lo, hi = 0, self.n
+        while lo < hi:
+            medio = (lo + hi) // 2
+            if self._clave(medio) < objetivo:
+                lo = medio + 1
+            else:
+                hi = medio
+        if lo < self.n and self._clave(lo) == objetivo:
+            return self._valor(lo)
+        return None
+
+    def claves(self) -> Iterator[str]:
+        for i in range(self.n):
+            yield self._clave(i).decode("utf-8")
+
+class ArtefactoLexico:
+    """Mismas funciones de búsqueda que Lexico, pero leyendo del archivo mapeado en memoria."""
+    def __init__(self, ruta: str, verificar: bool = False):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, n_tablas, checksum = _CABECERA.unpack_from(self.mm, 0)
+        if magia != MAGIA or version != VERSION_FORMATO:
+            raise ValueError(f"{ruta} no es un léxico compilado compatible (versión {version}).")
+        self.checksum = checksum.hex()
+        if verificar and hashlib.sha256(self.mm[_CABECERA.size:]).digest() != checksum:
+            raise ValueError(f"{ruta} está dañado: el checksum no coincide.")
+        self.tablas = {}
+        for i in range(n_tablas):
+            nombre, posicion, _ = _ENTRADA.unpack_from(self.mm, _CABECERA.size + i * _ENTRADA.size)
+            self.tablas[nombre.rstrip(b"\x00").decode("ascii")] = _TablaOrdenada(self.mm, posicion)
+        self._compuestas = None
+
+    def buscar_pronombre_es(self, pronombre_es: str) -> Optional[Dict]:
+        return self.tablas["pronombres"].buscar(clave_busqueda(pronombre_es))
+
+    def buscar_conjugacion_con_tiempo(self, verbo_es: str, persona_id: int) -> Optional[Tuple[str, str]]:
+        encontrado = self.tablas["conjugaciones"].buscar(f"{clave_busqueda(verbo_es)}{_SEP}{persona_id}")
+        return tuple(encontrado) if encontrado and encontrado[1] is not None else None
+
+    def buscar_conjugacion_auto(self, verbo_es: str, persona_id: int) -> Optional[str]:
+        encontrado = self.tablas["conjugaciones"].buscar(f"{clave_busqueda(verbo_es)}{_SEP}{persona_id}")
+        return encontrado[1] if encontrado else None
+
+    def obtener_formas_verbales_compuestas(self) -> Set[str]:
+        if self._compuestas is None:
+            self._compuestas = set(self.tablas["compuestas"].claves())
+        return self._compuestas
+
+    def obtener_frases_morfema(self) -> List[str]:
+        return list(self.tablas["morfemas"].claves())
+
+    def buscar_traduccion_palabra(self, lema_es: str) -> Optional[str]:
+        raices = self.tablas["traducciones"].buscar(clave_busqueda(lema_es))
+        return raices[0] if raices else None
+
+    def buscar_todas_traducciones(self, lema_es: str) -> List[str]:
+        return self.tablas["traducciones"].buscar(clave_busqueda(lema_es)) or []
+
+    def buscar_morfema_desde_frase(self, frase_es: str) -> Optional[Dict]:
+        return self.tablas["morfemas"].buscar(clave_busqueda(frase_es))
+
+    def obtener_marcadores_modo(self, tipo_modo: str) -> List[Dict]:
+        return self.tablas["modos"].buscar(clave_busqueda(tipo_modo)) or []
+
+    def cerrar(self):
+        self.mm.close()
+
+def abrir_artefacto(ruta: str, verificar: bool = False) -> ArtefactoLexico:
+    return ArtefactoLexico(ruta, verificar)
+
+if __name__ == "__main__":
+    from traductor_kichwa.config.conexion import ARTEFACTO_RUTA
+    from traductor_kichwa.db.consultas import cargar_lexico
+    destino = sys.argv[1] if len(sys.argv) > 1 else ARTEFACTO_RUTA
+    if not destino:
+        sys.exit("Uso: python -m traductor_kichwa.db.artefacto destino.kxlex (o define TRADUCTOR_ARTEFACTO)")
+    checksum = compilar_artefacto(cargar_lexico(), destino)
+    print(f"Léxico compilado en {destino} (sha256 {checksum})")
@@ -0,0 +1,119 @@
+# db/backend.py
+import sqlite3
+import threading
+from typing import Optional, List, Dict
+
+from traductor_kichwa.config.conexion import BACKEND, SQLITE_RUTA, obtener_conexion, obtener_pool
+from traductor_kichwa.db.lexico import clave_busqueda, invalidar_lexico
+from traductor_kichwa.utils.traza import contar
+
+# Las consultas de db/consultas.py se escriben con el estilo de parámetros de MySQL (%s);
+# cada backend las adapta y devuelve siempre una lista de dicts.
+
+class _ContadorConsultas:
+    """Lleva la cuenta de las consultas ejecutadas, para benchmarks y diagnóstico."""
+    def __init__(self):
+        self._consultas = 0
+        self._lock_contador = threading.Lock()
+
+    def _contar(self):
+        with self._lock_contador:
+            self._consultas += 1
+        contar("sql")
+
+    def estadisticas(self) -> dict:
+        return {"backend": self.nombre, "consultas": self._consultas}
+
+class BackendMySQL(_ContadorConsultas):
+    nombre = "mysql"
+
+    def consultar(self, sql: str, params: tuple) -> List[Dict]:
+        self._contar()
+        with obtener_conexion() as conn:
+            cur = conn.cursor(dictionary=True)
+            try:
+                cur.execute(sql, params)
+                return cur.fetchall()
+            finally:
+                cur.close()
+
+    def estadisticas(self) -> dict:
+        return {**super().estadisticas(), **obtener_pool().estadisticas()}
+
+    def cerrar(self):
+        obtener_pool().cerrar()
+
+def _comparar_es_ci(a: str, b: str) -> int:
+    a, b = clave_busqueda(a), clave_busqueda(b)
+    return (a > b) - (a < b)
+
+def abrir_sqlite(ruta: str, solo_lectura: bool = True) -> sqlite3.Connection:
+    """
+    Abre el archivo SQLite del traductor registrando la intercalación `es_ci`
+    (sin tildes ni mayúsculas, como utf8mb4_*_ci en MySQL) que usan sus columnas.
+    """
+    if solo_lectura:
+        conn = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(ruta, check_same_thread=False)
+    conn.create_collation("es_ci", _comparar_es_ci)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+class BackendSQLite(_ContadorConsultas):
+    """Archivo embebido de solo lectura: sin red ni límite de conexiones (una por hilo)."""
+    nombre = "sqlite"
+
+    def __init__(self, ruta: str = SQLITE_RUTA):
+        super().__init__()
+        self.ruta = ruta
+        self._local = threading.local()
+
+    def _conexion(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = abrir_sqlite(self.ruta)
+            contar("conexiones")
+        return conn
+
+    def consultar(self, sql: str, params: tuple) -> List[Dict]:
+        self._contar()
+        cur = self._conexion().execute(sql.replace("%s", "?"), params)
+        try:
+            return [dict(row) for row in cur.fetchall()]
+        finally:
+            cur.close()
+
+    def cerrar(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def crear_backend(nombre: str = BACKEND):
+    if nombre == "mysql":
+        return BackendMySQL()
+    if nombre == "sqlite":
+        return BackendSQLite()
+    raise ValueError(f"Backend '{nombre}' desconocido (usa 'mysql' o 'sqlite').")
+
+def obtener_backend():
+    """Backend del proceso, elegido con TRADUCTOR_BACKEND (por defecto mysql)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = crear_backend()
+    return _backend
+
+def usar_backend(backend):
+    """Cambia el backend en caliente; las cachés que dependen de los datos se vacían."""
+    global _backend
+    with _backend_lock:
+        anterior, _backend = _backend, backend
+    if anterior is not None and anterior is not backend:
+        anterior.cerrar()
+    invalidar_lexico()
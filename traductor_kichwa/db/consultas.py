@@ -1,50 +1,278 @@
 # db/consultas.py
-from traductor_kichwa.config.conexion import conectar_bd
-from typing import Optional, List, Dict
+import functools
+import math
+import os
+import threading
+import time
+from traductor_kichwa.config.conexion import ARTEFACTO_RUTA
+from traductor_kichwa.db.artefacto import ArtefactoLexico, abrir_artefacto
+from traductor_kichwa.db.backend import obtener_backend
+from traductor_kichwa.db.lexico import (
+    Lexico, COLUMNAS_CONJUGACION, clave_busqueda, lexico_activo, activar_lexico, al_recargar,
+)
+from traductor_kichwa.utils.cache import FALTA, Memo
+from traductor_kichwa.utils import metricas
+from traductor_kichwa.utils.traza import traza_actual
+from typing import Optional, List, Dict, Iterable, Set, Tuple
+
+# "mysql": cada búsqueda consulta la BD | "memoria": se carga el léxico una vez y se responde desde RAM
+MODO_LEXICO = os.environ.get("TRADUCTOR_LEXICO", "mysql")
+_carga_lock = threading.Lock()
+MAX_CLAVES_CONSULTA = 500   # claves por cada IN (...) al resolver lotes grandes
+# Memo de resolver_claves para palabras y morfemas: límites separados para aciertos y fallos
+MEMO_ACIERTOS = int(os.environ.get("TRADUCTOR_MEMO_ACIERTOS", "20000"))
+MEMO_FALLOS   = int(os.environ.get("TRADUCTOR_MEMO_FALLOS", "50000"))
+# Modo mysql: segundos que valen las formas compuestas y el autómata de frases antes de releerlos (0 = no caducan)
+LEXICO_TTL = float(os.environ.get("TRADUCTOR_LEXICO_TTL", "300"))
+_formas_compuestas = None   # (conjunto de formas de varias palabras, instante de vencimiento)
+
+def vencimiento_lexico() -> float:
+    """Instante (time.monotonic) en que caduca algo derivado de la BD en modo mysql; math.inf si no caduca."""
+    return time.monotonic() + LEXICO_TTL if LEXICO_TTL else math.inf
+
+# Modo mysql: por clave plegada, las raíces (palabras) y las filas de morfema que devolvió
+# la BD, también cuando no hay ninguna: las palabras desconocidas son lo normal
+memo_palabras = Memo("memo.palabras", MEMO_ACIERTOS, MEMO_FALLOS, ttl=LEXICO_TTL)
+memo_morfemas = Memo("memo.morfemas", MEMO_ACIERTOS, MEMO_FALLOS, ttl=LEXICO_TTL)
+
+def _instrumentada(funcion):
+    """
+    Cada función pública de búsqueda: etapa en la traza activa y latencia en las métricas.
+    Un solo envoltorio; sin traza ni servidor de métricas solo llama a la función.
+    """
+    nombre = funcion.__name__
+    nombre_etapa = f"consultas.{nombre}"
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        traza = traza_actual()
+        if traza is None and not metricas.activas:
+            return funcion(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            segundos = time.perf_counter() - inicio
+            if traza is not None:
+                traza.sumar_etapa(nombre_etapa, segundos)
+            if metricas.activas:
+                metricas.LATENCIA_CONSULTAS.observar(segundos, funcion=nombre)
+    return envoltura
+
+def _consultar(sql: str, params: tuple) -> List[Dict]:
+    return obtener_backend().consultar(sql, params)
+
+def _consultar_uno(sql: str, params: tuple) -> Optional[Dict]:
+    rows = _consultar(sql, params)
+    return rows[0] if rows else None
+
+TABLAS_LEXICO = ("personas", "conjugaciones", "traducciones", "morfemas")
+
+def _filas_lexico(claves: Optional[tuple] = None, tablas: Iterable[str] = TABLAS_LEXICO) -> Dict[str, List[Dict]]:
+    """
+    Una consulta por cada tabla de `tablas`. Sin claves lee las tablas completas;
+    con claves solo las filas cuya columna en español está en `claves` (WHERE ... IN).
+    """
+    def donde(*columnas):
+        if claves is None:
+            return "", ()
+        marcas = ", ".join(["%s"] * len(claves))
+        filtro = " OR ".join(f"{col} IN ({marcas})" for col in columnas)
+        return f"WHERE {filtro}", claves * len(columnas)
+
+    columnas_conj = ", ".join(c for _, col_es, col_ki in COLUMNAS_CONJUGACION for c in (col_es, col_ki))
+    filtro_per, params_per = donde("pronombre_es")
+    filtro_conj, params_conj = donde(*(col_es for _, col_es, _ in COLUMNAS_CONJUGACION))
+    filtro_pal, params_pal = donde("pe.lema")
+    filtro_mor, params_mor = donde("tm.frase_es")
+    sentencias = dict(
+        personas=(f"""
+            SELECT id, pronombre_es, pronombre_ki, numero
+            FROM persona
+            {filtro_per}
+            ORDER BY id
+        """, params_per),
+        conjugaciones=(f"""
+            SELECT persona_id, {columnas_conj}
+            FROM conjugacion_ki
+            {filtro_conj}
+        """, params_conj),
+        traducciones=(f"""
+            SELECT pe.lema, pk.raiz
+            FROM palabra_es pe
+            JOIN traduccion t  ON pe.id = t.palabra_es_id
+            JOIN palabra_ki pk ON pk.id = t.palabra_ki_id
+            {filtro_pal}
+        """, params_pal),
+        morfemas=(f"""
+            SELECT tm.frase_es, m.id, m.forma, m.tipo, m.modo_aplicacion, m.elemento_a_eliminar
+            FROM traduccion_morfema tm
+            JOIN morfema m ON tm.morfema_id = m.id
+            {filtro_mor}
+        """, params_mor),
+    )
+    return {tabla: _consultar(*sentencias[tabla]) for tabla in tablas}
+
+def _filas_modos() -> List[Dict]:
+    # modo_oracional tiene un puñado de filas: siempre se trae entera
+    return _consultar("""
+        SELECT tipo, marcador, posicion
+        FROM modo_oracional
+    """, ())
+
+@_instrumentada
+def cargar_lexico() -> Lexico:
+    """Lee todas las tablas del léxico con una consulta por tabla."""
+    return Lexico.desde_filas(modos=_filas_modos(), **_filas_lexico())
+
+@_instrumentada
+def resolver_claves(claves: Iterable[str]) -> Lexico:
+    """
+    Resuelve de golpe todo lo que una oración (o un lote) puede necesitar: una consulta
+    por tabla en vez de una por token. Devuelve un Lexico pequeño con las mismas
+    funciones de búsqueda que este módulo. Las palabras y morfemas ya buscados (hayan
+    aparecido o no) salen de memo_palabras y memo_morfemas sin volver a la BD.
+    """
+    lex = _en_memoria()
+    if lex is not None:
+        return lex
+    # una clave por forma plegada: la BD ya compara sin tildes ni mayúsculas
+    unicas = {clave_busqueda(c): c for c in claves if c}
+    filas = {tabla: [] for tabla in TABLAS_LEXICO}
+    pendientes = {"personas": sorted(unicas.values()), "conjugaciones": sorted(unicas.values()),
+                  "traducciones": [], "morfemas": []}
+    for k, c in unicas.items():
+        raices = memo_palabras.obtener(k)
+        if raices is FALTA:
+            pendientes["traducciones"].append(c)
+        else:
+            filas["traducciones"].extend({"lema": k, "raiz": r} for r in raices)
+        morfemas = memo_morfemas.obtener(k)
+        if morfemas is FALTA:
+            pendientes["morfemas"].append(c)
+        else:
+            filas["morfemas"].extend(dict(m) for m in morfemas)
+
+    for tabla, lista in pendientes.items():
+        nuevas = []
+        for i in range(0, len(lista), MAX_CLAVES_CONSULTA):
+            nuevas.extend(_filas_lexico(tuple(lista[i:i+MAX_CLAVES_CONSULTA]), (tabla,))[tabla])
+        filas[tabla].extend(nuevas)
+        if tabla == "traducciones":
+            _recordar(memo_palabras, lista, nuevas, "lema", lambda row: row["raiz"])
+        elif tabla == "morfemas":
+            _recordar(memo_morfemas, lista, nuevas, "frase_es", lambda row: tuple(row.items()))
+    return Lexico.desde_filas(modos=_filas_modos(), **filas)
+
+def _recordar(memo: Memo, claves: List[str], rows: List[Dict], columna: str, valor):
+    """Guarda en `memo`, por clave plegada, la tupla de valores de sus filas (vacía si no hubo ninguna)."""
+    por_clave = {clave_busqueda(c): [] for c in claves}
+    for row in rows:
+        if row[columna] is not None:
+            por_clave.setdefault(clave_busqueda(row[columna]), []).append(valor(row))
+    for k, valores in por_clave.items():
+        memo.guardar(k, tuple(valores))
+
+def activar_lexico_memoria() -> Lexico:
+    """Carga (o recarga) el léxico desde la BD y pasa todas las búsquedas a memoria."""
+    lex = cargar_lexico()
+    activar_lexico(lex)
+    return lex
+
+recargar_lexico = activar_lexico_memoria
+
+def activar_artefacto(ruta: str = ARTEFACTO_RUTA) -> ArtefactoLexico:
+    """Pasa todas las búsquedas al léxico precompilado de `ruta` (abierto con mmap)."""
+    lex = abrir_artefacto(ruta)
+    activar_lexico(lex)
+    return lex
+
+def _en_memoria():
+    """El léxico activo (Lexico o ArtefactoLexico), cargándolo la primera vez si así se configuró."""
+    lex = lexico_activo()
+    if lex is None and (ARTEFACTO_RUTA or MODO_LEXICO == "memoria"):
+        with _carga_lock:
+            lex = lexico_activo()
+            if lex is None:
+                lex = activar_artefacto() if ARTEFACTO_RUTA else activar_lexico_memoria()
+    return lex
+
+@_instrumentada
 def buscar_pronombre_es(pronombre_es: str) -> Optional[Dict]:
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.buscar_pronombre_es(pronombre_es)
+    return _consultar_uno("""
         SELECT id, pronombre_ki, numero
         FROM persona
         WHERE pronombre_es = %s
         LIMIT 1
     """, (pronombre_es,))
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
-    return row
 
+@_instrumentada
+def buscar_conjugacion_con_tiempo(verbo_es: str, persona_id: int) -> Optional[Tuple[str, str]]:
+    """
+    Devuelve (tiempo, forma kichwa) con UNA sola consulta sobre las cuatro columnas
+    de conjugacion_ki; tiempo es "presente", "pasado", "futuro" o "continuo".
+    """
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.buscar_conjugacion_con_tiempo(verbo_es, persona_id)
+    columnas = [c for _, col_es, col_ki in COLUMNAS_CONJUGACION for c in (col_es, col_ki)]
+    columnas_es = [col_es for _, col_es, _ in COLUMNAS_CONJUGACION]
+    rows = _consultar(f"""
+        SELECT {", ".join(columnas)}
+        FROM conjugacion_ki
+        WHERE persona_id = %s
+        AND ({" OR ".join(f"{col} = %s" for col in columnas_es)})
+    """, (persona_id,) + (verbo_es,) * len(columnas_es))
+    # misma prioridad que antes: presente, pasado, futuro y continuo; la primera fila que
+    # coincide decide, aunque su forma kichwa esté en NULL (entonces no hay conjugación)
+    clave = clave_busqueda(verbo_es)
+    for tiempo, col_es, col_ki in COLUMNAS_CONJUGACION:
+        for row in rows:
+            if row[col_es] and clave_busqueda(row[col_es]) == clave:
+                return (tiempo, row[col_ki]) if row[col_ki] is not None else None
+    return None
+
+@_instrumentada
 def buscar_conjugacion_auto(verbo_es: str, persona_id: int) -> Optional[str]:
-    mapping = [
-        ("verbo_conjugado_es",        "verbo_conjugado"       ),
-        ("verbo_conjugado_pasado_es", "verbo_conjugado_pasado"),
-        ("verbo_conjugado_futuro_es", "verbo_conjugado_futuro"),
-        ("verbo_continuo_es",         "verbo_continuo"        ),
-    ]
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    for col_es, col_ki in mapping:
-        cur.execute(f"""
-            SELECT {col_ki}
+    encontrado = buscar_conjugacion_con_tiempo(verbo_es, persona_id)
+    return encontrado[1] if encontrado else None
+
+@_instrumentada
+def obtener_formas_verbales_compuestas() -> Set[str]:
+    """
+    Todas las formas conjugadas en español de más de una palabra ("esta cocinando"),
+    sin importar la persona, ya plegadas con clave_busqueda. En modo mysql se guardan
+    LEXICO_TTL segundos, así que las formas nuevas de la BD aparecen sin reiniciar.
+    """
+    global _formas_compuestas
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.obtener_formas_verbales_compuestas()
+    guardadas = _formas_compuestas
+    if guardadas is None or time.monotonic() > guardadas[1]:
+        union = " UNION ".join(f"""
+            SELECT {col_es} AS forma
             FROM conjugacion_ki
-            WHERE {col_es} = %s
-            AND persona_id = %s
-            LIMIT 1
-        """, (verbo_es, persona_id))
-        row = cur.fetchone()
-        if row:
-            cur.close()
-            conn.close()
-            return row[col_ki]
-    cur.close()
-    conn.close()
-    return None
+            WHERE {col_es} LIKE '% %'
+        """ for _, col_es, _ in COLUMNAS_CONJUGACION)
+        guardadas = _formas_compuestas = (
+            {clave_busqueda(row["forma"]) for row in _consultar(union, ())}, vencimiento_lexico())
+    return guardadas[0]
+
+@al_recargar
+def _olvidar_formas_compuestas():
+    global _formas_compuestas
+    _formas_compuestas = None
 
+@_instrumentada
 def buscar_traduccion_palabra(lema_es: str) -> Optional[str]:
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.buscar_traduccion_palabra(lema_es)
+    row = _consultar_uno("""
         SELECT pk.raiz
         FROM palabra_es pe
         JOIN traduccion t  ON pe.id = t.palabra_es_id
@@ -52,51 +280,59 @@ def buscar_traduccion_palabra(lema_es: str) -> Optional[str]:
         WHERE pe.lema = %s
         LIMIT 1
     """, (lema_es,))
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
     return row["raiz"] if row else None
 
+@_instrumentada
 def buscar_todas_traducciones(lema_es: str) -> List[str]:
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.buscar_todas_traducciones(lema_es)
+    rows = _consultar("""
         SELECT pk.raiz
         FROM palabra_es pe
         JOIN traduccion t ON pe.id = t.palabra_es_id
         JOIN palabra_ki pk ON pk.id = t.palabra_ki_id
         WHERE pe.lema = %s
     """, (lema_es,))
-    traducciones = [row["raiz"] for row in cur.fetchall()]
-    cur.close()
-    conn.close()
-    return traducciones
+    return [row["raiz"] for row in rows]
 
+@_instrumentada
 def buscar_morfema_desde_frase(frase_es: str) -> Optional[Dict]:
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.buscar_morfema_desde_frase(frase_es)
+    return _consultar_uno("""
         SELECT m.id, m.forma,m.tipo, m.modo_aplicacion, m.elemento_a_eliminar
         FROM traduccion_morfema tm
         JOIN morfema m ON tm.morfema_id = m.id
         WHERE tm.frase_es = %s
         LIMIT 1
     """, (frase_es,))
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
-    return row
 
+@_instrumentada
+def obtener_frases_morfema() -> List[str]:
+    """Todas las frase_es de traduccion_morfema (para construir el autómata de frases)."""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.obtener_frases_morfema()
+    rows = _consultar("""
+        SELECT DISTINCT frase_es
+        FROM traduccion_morfema
+    """, ())
+    return [row["frase_es"] for row in rows]
+
+@al_recargar
+def _olvidar_memos():
+    memo_palabras.limpiar()
+    memo_morfemas.limpiar()
+
+@_instrumentada
 def obtener_marcadores_modo(tipo_modo: str) -> List[Dict]:
-    conn = conectar_bd()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
+    lex = _en_memoria()
+    if lex is not None:
+        return lex.obtener_marcadores_modo(tipo_modo)
+    return _consultar("""
         SELECT marcador, posicion
         FROM modo_oracional
         WHERE tipo = %s
     """, (tipo_modo,))
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
-    return rows
-
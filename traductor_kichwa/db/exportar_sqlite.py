@@ -0,0 +1,134 @@
+# db/exportar_sqlite.py
+"""
+Copia el esquema y los datos de `traductorfinal` (MySQL) a un único archivo SQLite
+indexado que se puede usar con TRADUCTOR_BACKEND=sqlite:
+
+    python -m traductor_kichwa.db.exportar_sqlite [destino.sqlite3]
+"""
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from traductor_kichwa.config.conexion import SQLITE_RUTA, conectar_bd
+from traductor_kichwa.db.backend import abrir_sqlite
+from traductor_kichwa.db.lexico import COLUMNAS_CONJUGACION
+
+# tabla -> columnas en español que se comparan sin tildes ni mayúsculas (intercalación es_ci)
+TABLAS = {
+    "persona":            ["pronombre_es"],
+    "conjugacion_ki":     [col_es for _, col_es, _ in COLUMNAS_CONJUGACION],
+    "palabra_es":         ["lema"],
+    "palabra_ki":         [],
+    "traduccion":         [],
+    "morfema":            [],
+    "traduccion_morfema": ["frase_es"],
+    "modo_oracional":     ["tipo"],
+}
+
+INDICES = [
+    "CREATE INDEX ix_persona_pronombre ON persona(pronombre_es)",
+    *(f"CREATE INDEX ix_conj_{col_es} ON conjugacion_ki({col_es}, persona_id)"
+      for _, col_es, _ in COLUMNAS_CONJUGACION),
+    "CREATE INDEX ix_palabra_es_lema ON palabra_es(lema)",
+    "CREATE INDEX ix_traduccion_es ON traduccion(palabra_es_id)",
+    "CREATE INDEX ix_tmorfema_frase ON traduccion_morfema(frase_es)",
+    "CREATE INDEX ix_modo_tipo ON modo_oracional(tipo)",
+]
+
+# Tipos de MySQL (nombres de mysql.connector.FieldType) por afinidad de SQLite; el resto, TEXT
+AFINIDAD_MYSQL = {
+    "INTEGER": {"TINY", "SHORT", "LONG", "LONGLONG", "INT24", "YEAR", "BIT"},
+    "REAL":    {"FLOAT", "DOUBLE"},
+    "NUMERIC": {"DECIMAL", "NEWDECIMAL"},
+}
+
+def _afinidad(columna: str, tipo_mysql: Optional[str], valores: Sequence) -> str:
+    """
+    Sin afinidad, SQLite no usa el índice de una columna al compararla con otra
+    (traduccion.palabra_es_id = palabra_es.id acababa en un SCAN de traduccion).
+    """
+    if tipo_mysql:
+        return next((af for af, tipos in AFINIDAD_MYSQL.items() if tipo_mysql in tipos), "TEXT")
+    if columna.endswith("_id"):
+        return "INTEGER"
+    muestra = next((v for v in valores if v is not None), None)
+    if isinstance(muestra, int):
+        return "INTEGER"
+    if isinstance(muestra, float):
+        return "REAL"
+    return "TEXT"
+
+def _definicion_columna(tabla: str, columna: str, tipo_mysql: Optional[str] = None, valores: Sequence = ()) -> str:
+    if columna == "id":
+        return "id INTEGER PRIMARY KEY"
+    if columna in TABLAS[tabla]:
+        return f"{columna} TEXT COLLATE es_ci"
+    return f"{columna} {_afinidad(columna, tipo_mysql, valores)}"
+
+def crear_sqlite(destino: str, datos: Dict[str, Tuple[List[str], Sequence[tuple]]],
+                 tipos: Optional[Dict[str, Dict[str, str]]] = None):
+    """
+    Escribe `datos` (tabla -> (columnas, filas)) en `destino` con sus índices.
+    `tipos` (tabla -> columna -> tipo de MySQL) decide la afinidad de cada columna;
+    sin él se deduce del nombre (*_id) o de los valores.
+    Se construye en un archivo temporal y se reemplaza de forma atómica.
+    """
+    carpeta = os.path.dirname(os.path.abspath(destino))
+    fd, temporal = tempfile.mkstemp(suffix=".sqlite3", dir=carpeta)
+    os.close(fd)
+    try:
+        conn = abrir_sqlite(temporal, solo_lectura=False)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            for tabla, (columnas, filas) in datos.items():
+                tipos_tabla = (tipos or {}).get(tabla, {})
+                defs = ", ".join(_definicion_columna(tabla, c, tipos_tabla.get(c), [f[i] for f in filas])
+                                 for i, c in enumerate(columnas))
+                conn.execute(f"CREATE TABLE {tabla} ({defs})")
+                marcas = ", ".join("?" * len(columnas))
+                conn.executemany(f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({marcas})", filas)
+            for indice in INDICES:
+                conn.execute(indice)
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        os.chmod(temporal, 0o644)   # mkstemp lo crea solo para el dueño
+        os.replace(temporal, destino)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+def _valor_sqlite(valor):
+    # Decimal, fechas, enums... se guardan como texto; lo demás tal cual
+    if valor is None or isinstance(valor, (int, float, str, bytes)):
+        return valor
+    return str(valor)
+
+def leer_mysql() -> Tuple[Dict[str, Tuple[List[str], List[tuple]]], Dict[str, Dict[str, str]]]:
+    """Las tablas del léxico como (datos, tipos), en el formato de crear_sqlite."""
+    conn = conectar_bd()   # sin el conector avisa de qué instalar
+    from mysql.connector import FieldType
+    try:
+        cur = conn.cursor()
+        datos, tipos = {}, {}
+        for tabla in TABLAS:
+            cur.execute(f"SELECT * FROM {tabla}")
+            filas = [tuple(_valor_sqlite(v) for v in fila) for fila in cur.fetchall()]
+            datos[tabla] = (list(cur.column_names), filas)
+            tipos[tabla] = {d[0]: FieldType.get_info(d[1]) for d in cur.description}
+        cur.close()
+        return datos, tipos
+    finally:
+        conn.close()
+
+def exportar_sqlite(destino: str = SQLITE_RUTA) -> str:
+    datos, tipos = leer_mysql()
+    crear_sqlite(destino, datos, tipos)
+    return destino
+
+if __name__ == "__main__":
+    destino = exportar_sqlite(sys.argv[1] if len(sys.argv) > 1 else SQLITE_RUTA)
+    print(f"Léxico exportado a {destino}")
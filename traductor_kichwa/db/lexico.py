@@ -0,0 +1,135 @@
+# db/lexico.py
+import threading
+import unicodedata
+from typing import Optional, List, Dict, Iterable, Set, Tuple
+
+def clave_busqueda(texto: str) -> str:
+    """
+    Pliega el texto igual que la intercalación *_ci de MySQL:
+    sin tildes y en minúsculas ("Él" == "el", "TÚ" == "tu").
+    """
+    texto = unicodedata.normalize('NFD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return texto.lower()
+
+# Columnas de conjugacion_ki en el orden de prioridad de buscar_conjugacion_auto
+COLUMNAS_CONJUGACION = [
+    ("presente", "verbo_conjugado_es",        "verbo_conjugado"       ),
+    ("pasado",   "verbo_conjugado_pasado_es", "verbo_conjugado_pasado"),
+    ("futuro",   "verbo_conjugado_futuro_es", "verbo_conjugado_futuro"),
+    ("continuo", "verbo_continuo_es",         "verbo_continuo"        ),
+]
+
+class Lexico:
+    """
+    Copia en memoria de las tablas del léxico, indexada por hash.
+    Responde con las mismas formas que las funciones de db/consultas.py.
+    """
+    def __init__(self):
+        self.pronombres   = {}   # pronombre_es -> {id, pronombre_ki, numero}
+        self.conjugaciones = {}  # índice inverso: (verbo_es, persona_id) -> (tiempo, forma ki)
+        self.formas_compuestas = set()  # formas de varias palabras ("esta cocinando"), de cualquier persona
+        self.traducciones = {}   # lema -> [raiz, ...]
+        self.morfemas     = {}   # frase_es -> {id, forma, tipo, modo_aplicacion, elemento_a_eliminar}
+        self.modos        = {}   # tipo -> [{marcador, posicion}, ...]
+
+    @classmethod
+    def desde_filas(cls, personas: Iterable[Dict], conjugaciones: Iterable[Dict],
+                    traducciones: Iterable[Dict], morfemas: Iterable[Dict],
+                    modos: Iterable[Dict]) -> "Lexico":
+        # Una columna de búsqueda en NULL nunca coincide con `col = %s` en SQL: esas filas se saltan
+        lex = cls()
+        for p in personas:
+            if p["pronombre_es"] is None:
+                continue
+            lex.pronombres.setdefault(clave_busqueda(p["pronombre_es"]), {
+                "id": p["id"], "pronombre_ki": p["pronombre_ki"], "numero": p["numero"],
+            })
+        # columna por columna, para que un presente gane a un pasado igual que en SQL. Una fila
+        # que coincide con la forma kichwa en NULL también gana: la consulta devuelve None y ahí para
+        conjugaciones = list(conjugaciones)
+        for tiempo, col_es, col_ki in COLUMNAS_CONJUGACION:
+            for c in conjugaciones:
+                if c.get(col_es):
+                    forma_es = clave_busqueda(c[col_es])
+                    lex.conjugaciones.setdefault((forma_es, c["persona_id"]), (tiempo, c.get(col_ki)))
+                    if " " in forma_es:
+                        lex.formas_compuestas.add(forma_es)
+        for t in traducciones:
+            if t["lema"] is not None:
+                lex.traducciones.setdefault(clave_busqueda(t["lema"]), []).append(t["raiz"])
+        for m in morfemas:
+            if m["frase_es"] is None:
+                continue
+            lex.morfemas.setdefault(clave_busqueda(m["frase_es"]), {
+                "id": m["id"], "forma": m["forma"], "tipo": m["tipo"],
+                "modo_aplicacion": m["modo_aplicacion"],
+                "elemento_a_eliminar": m["elemento_a_eliminar"],
+            })
+        for m in modos:
+            if m["tipo"] is not None:
+                lex.modos.setdefault(clave_busqueda(m["tipo"]), []).append(
+                    {"marcador": m["marcador"], "posicion": m["posicion"]})
+        return lex
+
+    def buscar_pronombre_es(self, pronombre_es: str) -> Optional[Dict]:
+        row = self.pronombres.get(clave_busqueda(pronombre_es))
+        return dict(row) if row else None
+
+    def buscar_conjugacion_con_tiempo(self, verbo_es: str, persona_id: int) -> Optional[Tuple[str, str]]:
+        encontrado = self.conjugaciones.get((clave_busqueda(verbo_es), persona_id))
+        return encontrado if encontrado and encontrado[1] is not None else None
+
+    def buscar_conjugacion_auto(self, verbo_es: str, persona_id: int) -> Optional[str]:
+        encontrado = self.conjugaciones.get((clave_busqueda(verbo_es), persona_id))
+        return encontrado[1] if encontrado else None
+
+    def obtener_formas_verbales_compuestas(self) -> Set[str]:
+        return self.formas_compuestas
+
+    def obtener_frases_morfema(self) -> List[str]:
+        return list(self.morfemas)
+
+    def buscar_traduccion_palabra(self, lema_es: str) -> Optional[str]:
+        raices = self.traducciones.get(clave_busqueda(lema_es))
+        return raices[0] if raices else None
+
+    def buscar_todas_traducciones(self, lema_es: str) -> List[str]:
+        return list(self.traducciones.get(clave_busqueda(lema_es), ()))
+
+    def buscar_morfema_desde_frase(self, frase_es: str) -> Optional[Dict]:
+        row = self.morfemas.get(clave_busqueda(frase_es))
+        return dict(row) if row else None
+
+    def obtener_marcadores_modo(self, tipo_modo: str) -> List[Dict]:
+        return [dict(m) for m in self.modos.get(clave_busqueda(tipo_modo), ())]
+
+# --- Léxico activo del proceso ---
+_lexico = None
+_lexico_lock = threading.Lock()
+_al_recargar = []
+
+def lexico_activo():
+    """El léxico activo (Lexico, o ArtefactoLexico de db/artefacto.py) o None si se consulta la BD."""
+    return _lexico
+
+def al_recargar(funcion):
+    """Registra una función a llamar cada vez que cambia el léxico (p.ej. vaciar cachés)."""
+    _al_recargar.append(funcion)
+    return funcion
+
+def invalidar_lexico():
+    for funcion in list(_al_recargar):
+        funcion()
+
+def activar_lexico(lexico):
+    global _lexico
+    with _lexico_lock:
+        _lexico = lexico
+    invalidar_lexico()
+
+def desactivar_lexico():
+    global _lexico
+    with _lexico_lock:
+        _lexico = None
+    invalidar_lexico()
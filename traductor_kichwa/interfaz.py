@@ -0,0 +1,218 @@
+# interfaz.py
+"""
+Núcleo de interfaz compartido por app.py y app_cloud.py. El panel de traducción
+(entrada, botones, salida, audio y traza) es un fragmento de Streamlit: sus botones
+y su cuadro de texto vuelven a ejecutar solo el panel, no el CSS, las imágenes ni
+las instrucciones que lo rodean.
+"""
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from traductor_kichwa.db.consultas import buscar_todas_traducciones
+from traductor_kichwa.traduccion import traducir_oracion, traducir_con_traza
+from traductor_kichwa.tts.servidor_audio import url_audio
+from traductor_kichwa.tts.trabajadores import sintetizar_audio
+
+# Con TRADUCTOR_TRAZA=1 se muestra bajo la traducción dónde se fue el tiempo (etapas, SQL, cachés)
+MOSTRAR_TRAZA = os.environ.get("TRADUCTOR_TRAZA", "0") == "1"
+
+# st.fragment (Streamlit >= 1.37), st.experimental_fragment en versiones anteriores; sin ellos, función normal
+fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda f: f)
+
+def rerun_panel():
+    """Vuelve a ejecutar solo el panel (o toda la app si esta versión de Streamlit no sabe hacerlo)."""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
+
+def iniciar_estado():
+    for clave, valor in (("texto_entrada", ""), ("traduccion", ""), ("grabando_audio", False),
+                         ("audio_grabado", None), ("auto_transcribiendo", False)):
+        if clave not in st.session_state:
+            st.session_state[clave] = valor
+
+# === TRADUCCIÓN ===
+def traducir_texto(texto):
+    """traducir_oracion y, con TRADUCTOR_TRAZA=1, guarda la traza para el expander."""
+    if not MOSTRAR_TRAZA:
+        return traducir_oracion(texto)
+    try:
+        traduccion, traza = traducir_con_traza(texto)
+    except Exception as e:
+        if getattr(e, "traza", None):
+            st.session_state["traza"] = e.traza.como_dict()
+        raise
+    st.session_state["traza"] = traza.como_dict()
+    return traduccion
+
+def traducir_al_escribir():
+    """
+    on_change del cuadro de entrada: se traduce solo cuando el texto cambia (Streamlit
+    lo dispara al salir del cuadro o con Ctrl+Enter), sin reruns en bucle. Los callbacks
+    de una sesión corren uno tras otro en su hilo de script, así que no hace falta
+    proteger el resultado frente a un cambio posterior: ese llega en el siguiente rerun.
+    """
+    texto = st.session_state.get("texto_entrada_area", "").strip()
+    traduccion = ""
+    if len(texto.split()) >= 2:
+        try:
+            traduccion = traducir_texto(texto)
+        except Exception:
+            traduccion = ""   # mientras se escribe no se muestran avisos; el botón sí los muestra
+    st.session_state["traduccion"] = traduccion
+
+def _traducir_oracion_con_avisos(texto_entrada):
+    if texto_entrada.strip() == "":
+        st.warning("Por favor, ingresa una oración para traducir.")
+        st.session_state["traduccion"] = ""
+    elif len(texto_entrada.strip().split()) < 2:
+        st.warning("La oración debe tener al menos un sujeto y un verbo.")
+        st.session_state["traduccion"] = ""
+    else:
+        try:
+            st.session_state["traduccion"] = traducir_texto(texto_entrada)
+        except Exception as e:
+            st.warning(f"Ocurrió un error inesperado: {str(e)}")
+            st.session_state["traduccion"] = ""
+
+def _traducir_palabra(texto_entrada):
+    palabra = texto_entrada.strip().split()[0] if texto_entrada.strip() else ""
+    if not palabra:
+        st.warning("Por favor, ingresa una palabra para ver sus traducciones.")
+        st.session_state["traduccion"] = ""
+    else:
+        traducciones = buscar_todas_traducciones(palabra)
+        if traducciones:
+            st.session_state["traduccion"] = ", ".join(traducciones)
+        else:
+            st.session_state["traduccion"] = ""
+            st.warning("No se encontraron traducciones para esa palabra.")
+
+def _reproducir_audio(traduccion):
+    """El audio se genera solo al pulsar el botón; la página lleva la URL del servidor de audio o, sin él, los bytes."""
+    try:
+        url = url_audio(traduccion)
+        if url:
+            st.audio(url, format="audio/ogg" if url.endswith(".opus") else "audio/mp3", autoplay=True)
+        else:
+            st.audio(sintetizar_audio(traduccion), format="audio/mp3", autoplay=True)
+    except (TimeoutError, BrokenProcessPool, RuntimeError) as e:
+        # cola llena o síntesis colgada, trabajador muerto (p.ej. sin pyttsx3) o archivo vacío
+        st.warning(f"No se pudo generar el audio: {e}")
+
+def _mostrar_traza():
+    if MOSTRAR_TRAZA and st.session_state.get("traza"):
+        with st.expander("🔍 Traza de la última traducción"):
+            traza = st.session_state["traza"]
+            st.caption(f"{traza['total_ms']:.1f} ms · {traza['sql']} sentencias SQL · {traza['conexiones']} conexiones abiertas")
+            st.json(traza)
+
+# === PANELES ===
+@fragmento
+def panel_traduccion(al_pulsar_voz=None):
+    """Panel de app.py: oración, voz a texto (`al_pulsar_voz`), palabra y pronunciación."""
+    # Container de entrada modernizado
+    st.markdown('<div class="input-container fade-in">', unsafe_allow_html=True)
+    st.markdown('<div class="input-label">✍️ Ingresa una oracion o palabra a traducir</div>', unsafe_allow_html=True)
+
+    texto_entrada = st.text_area(
+        label="Área de texto para entrada",
+        value=st.session_state["texto_entrada"],
+        height=100,
+        max_chars=500,
+        placeholder="Escribe aquí tu oración o palabra en español...",
+        key="texto_entrada_area",
+        on_change=traducir_al_escribir,
+        label_visibility="collapsed"
+    )
+
+    # Grid de botones modernizado
+    st.markdown('<div class="button-grid">', unsafe_allow_html=True)
+    col_btn1, col_btn2, col_btn3 = st.columns(3)
+
+    with col_btn1:
+        btn_traducir = st.button("Traducir Oración", key="btn_traducir", use_container_width=True)
+    with col_btn2:
+        btn_voz = st.button("Voz a Texto", key="btn_voz", use_container_width=True)
+        if btn_voz and al_pulsar_voz:
+            al_pulsar_voz()
+    with col_btn3:
+        btn_multi = st.button("Traducir Palabra", key="btn_multi", use_container_width=True)
+
+    st.markdown('</div></div>', unsafe_allow_html=True)
+
+    # Lógica de los botones
+    if btn_multi:
+        _traducir_palabra(texto_entrada)
+    if btn_traducir:
+        _traducir_oracion_con_avisos(texto_entrada)
+
+    # Container de traducción modernizado - SIEMPRE VISIBLE
+    traduccion = st.session_state.get("traduccion", "")
+
+    st.markdown('<div class="input-container fade-in">', unsafe_allow_html=True)
+    st.markdown('<div class="input-label">🌍 Traducción en Kichwa</div>', unsafe_allow_html=True)
+
+    # Mostrar placeholder si no hay traducción
+    placeholder_text = "La traducción aparecerá aquí..." if not traduccion else ""
+
+    st.text_area(
+        label="Área de texto para traducción",
+        value=traduccion,
+        height=100,
+        key="traduccion_area",
+        disabled=True,
+        placeholder=placeholder_text,
+        label_visibility="collapsed"
+    )
+
+    # Botón de audio modernizado: el audio se genera solo al pulsarlo, no en cada rerun
+    if traduccion:
+        st.markdown('<div class="button-grid">', unsafe_allow_html=True)
+        if st.button("Escuchar Pronunciación", key="btn_audio", use_container_width=True):
+            _reproducir_audio(traduccion)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # Traza de depuración de la última traducción
+    _mostrar_traza()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@fragmento
+def panel_traduccion_nube():
+    """Panel de app_cloud.py: entrada y salida centradas, sin audio."""
+    # Cuadro de entrada de texto y botones juntos, usando Streamlit y CSS mejorado
+    st.markdown('<div style="max-width:400px; margin:0 auto;">', unsafe_allow_html=True)
+    texto_entrada = st.text_area(
+        "Ingresa el texto a traducir:",
+        value=st.session_state["texto_entrada"],
+        height=80,
+        max_chars=500,
+        placeholder="Escribe aquí tu texto...",
+        key="texto_entrada_area",
+        on_change=traducir_al_escribir
+    )
+    col_btn_trad, col_btn_voz = st.columns([1, 1], gap="small")
+    with col_btn_trad:
+        btn_traducir = st.button("🔄 Traducir", key="btn_traducir", use_container_width=True)
+    with col_btn_voz:
+        st.button("🎤 Escuchar y transcribir voz", key="btn_voz", use_container_width=True)
+    if btn_traducir:
+        _traducir_oracion_con_avisos(texto_entrada)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Cuadro de traducción alineado y centrado
+    traduccion = st.session_state.get("traduccion", "")
+    st.markdown('<div style="max-width:400px; margin:0 auto;">', unsafe_allow_html=True)
+    st.text_area(
+        "Traducción:",
+        value=traduccion,
+        height=80,
+        key="traduccion_area",
+        disabled=True
+    )
+    _mostrar_traza()
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,83 @@
+# paralelo.py
+import gc
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from traductor_kichwa.db.backend import obtener_backend
+from traductor_kichwa.db.consultas import activar_artefacto, activar_lexico_memoria
+from traductor_kichwa.db.lexico import activar_lexico, desactivar_lexico, lexico_activo
+from traductor_kichwa.traduccion import traducir_lote
+
+def _iniciar_trabajador(artefacto: Optional[str] = None):
+    # Con fork el léxico ya viene del padre (copia al escribir): no hay nada que cargar.
+    # Con un artefacto precompilado cada proceso lo mapea (misma caché de páginas para todos);
+    # si no, con spawn/forkserver cada proceso lo carga de la BD una sola vez al arrancar.
+    if lexico_activo() is None:
+        if artefacto:
+            activar_artefacto(artefacto)
+        else:
+            activar_lexico_memoria()
+
+def _traducir_bloque(bloque: list[str]) -> list[dict]:
+    return traducir_lote(bloque)
+
+def _bloques(oraciones: Iterable[str], tam_bloque: int) -> Iterator[list[str]]:
+    bloque = []
+    for oracion in oraciones:
+        bloque.append(oracion)
+        if len(bloque) >= tam_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+def traducir_paralelo(oraciones: Iterable[str], procesos: Optional[int] = None,
+                      tam_bloque: int = 200, en_vuelo: Optional[int] = None,
+                      artefacto: Optional[str] = None) -> Iterator[dict]:
+    """
+    Reparte las oraciones en bloques entre `procesos` procesos y va devolviendo
+    los resultados de traducir_lote EN ORDEN. Como mucho hay `en_vuelo` bloques
+    pendientes, así que sirve igual para listas que para archivos enormes.
+    Con fork el léxico se carga una vez en el padre y los hijos lo comparten;
+    con `artefacto` (db/artefacto.py) cada proceso mapea ese archivo. Al terminar,
+    el padre vuelve al léxico que tenía (o a la BD si no tenía ninguno).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = en_vuelo or procesos * 2
+    metodos = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in metodos else None)
+    anterior = lexico_activo()
+    cambiado = False
+    if ctx.get_start_method() == "fork":
+        # el artefacto pedido manda aunque el padre ya tenga otro léxico activo
+        if artefacto:
+            activar_artefacto(artefacto)
+            cambiado = True
+        elif anterior is None:
+            activar_lexico_memoria()
+            cambiado = True
+        # los hijos no deben heredar sockets a MySQL ni conexiones SQLite abiertas
+        obtener_backend().cerrar()
+        # evita que el recolector de basura toque (y copie) las páginas del léxico en cada hijo
+        gc.freeze()
+
+    try:
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=ctx,
+                                 initializer=_iniciar_trabajador, initargs=(artefacto,)) as ejecutor:
+            pendientes = deque()
+            for bloque in _bloques(oraciones, tam_bloque):
+                pendientes.append(ejecutor.submit(_traducir_bloque, bloque))
+                if len(pendientes) >= en_vuelo:
+                    yield from pendientes.popleft().result()
+            while pendientes:
+                yield from pendientes.popleft().result()
+    finally:
+        gc.unfreeze()
+        # quien llame desde código recupera el léxico que tenía
+        if cambiado and anterior is not None:
+            activar_lexico(anterior)
+        elif cambiado:
+            desactivar_lexico()
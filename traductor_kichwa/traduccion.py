@@ -0,0 +1,363 @@
+# traduccion.py
+"""
+Núcleo del traductor: tokenización, búsquedas, ensamblado, caché y lotes.
+main.py (consola) y paralelo.py (procesos hijos) lo importan; ninguno de los dos
+lo ejecuta como script, así que sus cachés existen una sola vez por proceso.
+"""
+import os
+import time
+from traductor_kichwa.utils.tokenizer import normalizar_texto, tokenizar_oracion, agrupar_ngramas
+from traductor_kichwa.db import consultas
+from traductor_kichwa.db.backend import obtener_backend
+from traductor_kichwa.db.consultas import LEXICO_TTL, resolver_claves
+from traductor_kichwa.db.ensamblador import construir_oracion_kichwa
+from traductor_kichwa.db.lexico import al_recargar, lexico_activo
+from traductor_kichwa.utils.cache import CacheLRU, FALTA
+from traductor_kichwa.utils.metricas import LATENCIA, observar_traduccion, registrar_recolector
+from traductor_kichwa.utils.perfilador import perfilar
+from traductor_kichwa.utils.traza import Traza, contar_cache, etapa, medir, trazar
+
+# Tipos de morfema que van ANTES del verbo y deben extraerse a 'preverb'
+PREVERB_TYPES = {"ubicacion", "direccion", "tiempo/espacio"}
+# 2) Alias para pronombres no registrados (singular/plural)
+PRONOUN_ALIASES = {
+    "nosotras": "nosotros",
+    "ellas": "ellos",
+    "vosotras": "vosotros",
+    # ...añade más si las necesitas
+}
+# Pronombres con los que el REPL y los lotes prueban el futuro inmediato ("yo voy a ...")
+PRONOMBRES_FUTURO = ("yo", "tu",'tú', "el", "ella", "nosotros", "nosotras", "ustedes", "ellos", "ellas")
+
+# Caché de traducciones del proceso (compartida por todas las sesiones de Streamlit)
+CACHE_TAMANO   = int(os.environ.get("TRADUCTOR_CACHE_TAMANO", "10000"))
+CACHE_TTL      = float(os.environ.get("TRADUCTOR_CACHE_TTL", "3600"))      # segundos
+CACHE_TTL_ERROR = float(os.environ.get("TRADUCTOR_CACHE_TTL_ERROR", "60")) # los errores se recuerdan menos tiempo
+_cache_traducciones = CacheLRU(CACHE_TAMANO, ttl=CACHE_TTL)
+al_recargar(_cache_traducciones.limpiar)
+
+def _ttl_cache(ttl: float) -> float:
+    """
+    Con un léxico activo la caché se vacía al recargarlo; consultando la BD nada la
+    avisa de los cambios, así que no dura más que LEXICO_TTL, como los memos, las
+    formas compuestas y el autómata de frases.
+    """
+    if lexico_activo() is not None or not LEXICO_TTL:
+        return ttl
+    return min(ttl, LEXICO_TTL) if ttl else LEXICO_TTL
+
+def estadisticas_cache() -> dict:
+    return _cache_traducciones.estadisticas()
+
+def limpiar_cache():
+    _cache_traducciones.limpiar()
+
+@registrar_recolector
+def _metricas_caches_y_bd():
+    """Aciertos de la caché de traducciones y de los memos, sentencias SQL y uso del pool."""
+    caches = {"traducciones": estadisticas_cache()}
+    for memo in (consultas.memo_palabras, consultas.memo_morfemas):
+        caches[memo.nombre] = memo.estadisticas()
+    familias = [
+        ("traductor_cache_aciertos_total", "counter", "Aciertos por caché",
+         [({"cache": k}, v["aciertos"]) for k, v in caches.items()]),
+        ("traductor_cache_fallos_total", "counter", "Fallos por caché",
+         [({"cache": k}, v["fallos"]) for k, v in caches.items()]),
+        ("traductor_cache_tasa_aciertos", "gauge", "Proporción de aciertos por caché",
+         [({"cache": k}, v["tasa_aciertos"]) for k, v in caches.items()]),
+        ("traductor_cache_entradas", "gauge", "Entradas guardadas por caché",
+         [({"cache": k}, v["entradas"]) for k, v in caches.items()]),
+    ]
+    bd = obtener_backend().estadisticas()
+    familias.append(("traductor_bd_sentencias_total", "counter", "Sentencias SQL ejecutadas",
+                     [({"backend": bd["backend"]}, bd["consultas"])]))
+    if "tamano" in bd:   # backend MySQL: estado del pool
+        familias.append(("traductor_pool_conexiones", "gauge", "Conexiones del pool por estado",
+                         [({"estado": "maximo"}, bd["tamano"]), ({"estado": "abiertas"}, bd["abiertas"]),
+                          ({"estado": "libres"}, bd["libres"]),
+                          ({"estado": "en_uso"}, bd["abiertas"] - bd["libres"])]))
+    return familias
+
+def _con_cache(tipo: str, traducir, entrada: str) -> str:
+    """
+    La clave es la entrada ya normalizada (más el modo, que depende de los signos
+    "¿?" originales). Los ValueError (pronombre no registrado, estructura no
+    compatible...) también se guardan, con CACHE_TTL_ERROR. En modo mysql ninguna
+    entrada dura más que LEXICO_TTL (ver _ttl_cache).
+    """
+    clave = (tipo, normalizar_texto(entrada), detectar_modo(entrada))
+    guardado = _cache_traducciones.obtener(clave)
+    contar_cache("traducciones", guardado is not FALTA)
+    if guardado is not FALTA:
+        ok, valor = guardado
+        if ok:
+            return valor
+        raise ValueError(valor)
+    try:
+        salida = traducir(entrada)
+    except ValueError as e:
+        _cache_traducciones.guardar(clave, (False, str(e)), ttl=_ttl_cache(CACHE_TTL_ERROR))
+        raise
+    _cache_traducciones.guardar(clave, (True, salida), ttl=_ttl_cache(CACHE_TTL))
+    return salida
+
+def preparar_tokens(entrada: str) -> list[str]:
+    return agrupar_ngramas(tokenizar_oracion(normalizar_texto(entrada)))
+
+def claves_oracion(toks: list[str]) -> set[str]:
+    """Todo lo que la traducción de estos tokens puede llegar a buscar en el léxico."""
+    claves = {t.lower() for t in toks}
+    if toks:
+        claves.add(PRONOUN_ALIASES.get(toks[0].lower(), toks[0].lower()))
+    claves.add("a")   # traducir_futuro_inmediato prueba 'a' como morfema
+    return claves
+
+# `tabla` es cualquier objeto con las funciones de búsqueda de db/consultas.py:
+# el propio módulo (una consulta por búsqueda) o el Lexico de resolver_claves().
+@medir("construir_complemento")
+def construir_complemento(tokens_es: list[str], tabla=None):
+    if tabla is None:
+        tabla = consultas
+    comp_norm = []
+    comp_pre   = []
+    i = 0
+    n = len(tokens_es)
+    while i < n:
+        tok = tokens_es[i].lower()
+        m   = tabla.buscar_morfema_desde_frase(tok)
+        if m:
+            forma = m["forma"]
+            if i+1 < n:
+                nxt = tokens_es[i+1].lower()
+                raiz = tabla.buscar_traduccion_palabra(nxt)
+                if raiz:
+                    fusion = raiz + forma
+                else:
+                    fusion = tokens_es[i+1] + forma  # Une el morfema a la palabra original si no hay traducción
+                if m["tipo"] in PREVERB_TYPES:
+                    comp_pre.append(fusion)
+                else:
+                    comp_norm.append(fusion)
+                i += 2
+                continue
+            if m["tipo"] in PREVERB_TYPES:
+                comp_pre.append(forma)
+            else:
+                comp_norm.append(forma)
+            i += 1
+            continue
+        raiz = tabla.buscar_traduccion_palabra(tok)
+        if raiz:
+            comp_norm.append(raiz)
+        else:
+            comp_norm.append(tokens_es[i])  # Agrega la palabra original si no hay traducción
+        i += 1
+
+    return comp_norm, comp_pre
+
+def detectar_modo(entrada: str) -> str:
+    low = entrada.strip().lower()
+    if low.startswith("¿") or low.endswith("?"):
+        return "pregunta"
+    if " no " in f" {low} ":
+        return "negacion"
+    return "afirmacion"
+
+@observar_traduccion("oracion")
+@perfilar("oracion")
+def traducir_oracion(entrada: str, tabla=None, toks=None) -> str:
+    if tabla is None and toks is None:
+        return _con_cache("oracion", _traducir_oracion, entrada)
+    return _traducir_oracion(entrada, tabla, toks)
+
+def _traducir_oracion(entrada: str, tabla=None, toks=None) -> str:
+    if toks is None:
+        toks = preparar_tokens(entrada)
+    if tabla is None:
+        tabla = resolver_claves(claves_oracion(toks))
+
+    sujeto_es = PRONOUN_ALIASES.get(toks[0].lower(), toks[0].lower())
+    persona   = tabla.buscar_pronombre_es(sujeto_es)
+    if not persona:
+        raise ValueError(f"Pronombre '{sujeto_es}' no registrado en tabla persona.")
+    sujeto_ki = persona["pronombre_ki"]
+    pid       = persona["id"]
+
+    modo = detectar_modo(entrada)
+    if modo == "negacion":
+        sujeto_ki += " mana"
+        toks = [t for t in toks if t.lower() != "no"]
+
+    with etapa("deteccion_verbo"):
+        verb_idx = None
+        verbo_ki = None
+        for i, tok in enumerate(toks[1:], start=1):
+            c = tabla.buscar_conjugacion_auto(tok, pid)
+            if c:
+                verb_idx = i
+                verbo_ki = c
+                break
+        if verb_idx is None:
+            verb_idx = 1
+            t0 = toks[1]
+            verbo_ki = tabla.buscar_conjugacion_auto(t0, pid) \
+                    or tabla.buscar_traduccion_palabra(t0) \
+                    or t0
+
+    comp_es = toks[1:verb_idx] + toks[verb_idx+1:]
+    comp_norm, comp_pre = construir_complemento(comp_es, tabla)
+
+    if modo != "negacion":
+        for m in tabla.obtener_marcadores_modo(modo):
+            if m["posicion"] == "antes_verbo":
+                verbo_ki = f"{m['marcador']} {verbo_ki}"
+            else:
+                verbo_ki = f"{verbo_ki} {m['marcador']}"
+
+    partes = {
+        "sujeto":     sujeto_ki,
+        "complemento": comp_norm,
+        "preverb":    comp_pre,
+        "verbo":      verbo_ki
+    }
+    return construir_oracion_kichwa(partes)
+
+@observar_traduccion("futuro_inmediato")
+def traducir_futuro_inmediato(entrada: str, tabla=None, toks=None) -> str:
+    if tabla is None and toks is None:
+        return _con_cache("futuro_inmediato", _traducir_futuro_inmediato, entrada)
+    return _traducir_futuro_inmediato(entrada, tabla, toks)
+
+def _traducir_futuro_inmediato(entrada: str, tabla=None, toks=None) -> str:
+    if toks is None:
+        toks = preparar_tokens(entrada)
+    # se valida antes de ir a la BD: una entrada inválida no paga la consulta
+    if len(toks) < 4 or toks[2].lower() != "a":
+        raise ValueError("Estructura no compatible con futuro inmediato.")
+    if tabla is None:
+        tabla = resolver_claves(claves_oracion(toks))
+
+    sujeto_es = PRONOUN_ALIASES.get(toks[0].lower(), toks[0].lower())
+    verbo_ir  = toks[1].lower()
+    infinitivo_es = toks[3].lower()
+    resto = toks[4:]
+
+    persona = tabla.buscar_pronombre_es(sujeto_es)
+    if not persona:
+        raise ValueError(f"Pronombre '{sujeto_es}' no registrado.")
+    sujeto_ki = persona["pronombre_ki"]
+    pid = persona["id"]
+
+    conj_verbo = tabla.buscar_conjugacion_auto(verbo_ir, pid)
+    if not conj_verbo:
+        raise ValueError(f"No se encontró conjugación de '{verbo_ir}'.")
+
+    # modificar conjugación al estilo futuro inmediato (kri + sufijo)
+    if conj_verbo.endswith("nki"):
+        raiz = conj_verbo[:-3]
+        sufijo = "nki"
+    elif conj_verbo.endswith("ni"):
+        raiz = conj_verbo[:-2]
+        sufijo = "ni"
+    elif conj_verbo.endswith("nchik"):
+        raiz = conj_verbo[:-6]
+        sufijo = "nchik"
+    elif conj_verbo.endswith("kichik"):
+        raiz = conj_verbo[:-6]
+        sufijo = "kichik"
+    elif conj_verbo.endswith("kuna"):
+        raiz = conj_verbo[:-4]
+        sufijo = "kuna"
+    elif conj_verbo.endswith("ri"):
+        raiz = conj_verbo[:-2]
+        sufijo = "ri"
+    else:
+        raiz = conj_verbo
+        sufijo = ""
+    verbo_ki = f"{raiz}kri{sufijo}"
+
+    # El verbo en infinitivo se vuelve parte del complemento (sustantivado + morfema si aplica)
+    comp_norm, comp_pre = [], []
+
+    inf_comp = ["a", infinitivo_es]  # intenta aplicar 'a' como morfema con el verbo
+    norm_inf, pre_inf = construir_complemento(inf_comp, tabla)
+    comp_norm.extend(norm_inf)
+    comp_pre.extend(pre_inf)
+
+    if resto:
+        norm_extra, pre_extra = construir_complemento(resto, tabla)
+        comp_norm.extend(norm_extra)
+        comp_pre.extend(pre_extra)
+
+    partes = {
+        "sujeto": sujeto_ki,
+        "complemento": comp_norm,
+        "preverb": comp_pre,
+        "verbo": verbo_ki
+    }
+    return construir_oracion_kichwa(partes)
+
+def es_futuro_inmediato(entrada: str) -> bool:
+    return " a " in entrada and any(entrada.lower().startswith(p) for p in PRONOMBRES_FUTURO)
+
+def traducir_con_traza(entrada: str, traducir=traducir_oracion) -> tuple[str, Traza]:
+    """
+    Como `traducir(entrada)`, pero devuelve también la Traza de esa traducción
+    (ver utils/traza.py). Si la traducción falla, la excepción lleva la traza en `e.traza`.
+    """
+    with trazar() as traza:
+        try:
+            salida = traducir(entrada)
+        except Exception as e:
+            e.traza = traza
+            raise
+    return salida, traza
+
+@LATENCIA.cronometrar(punto="lote")
+def traducir_lote(oraciones: list[str]) -> list[dict]:
+    """
+    Traduce muchas oraciones juntando primero las claves únicas de TODO el lote,
+    de modo que cada pronombre, palabra o morfema se busca una sola vez.
+    Devuelve, en el mismo orden, un dict por oración:
+    {"entrada", "salida", "modo", "error", "tiempo_ms"}; una oración con error
+    no detiene el resto.
+    """
+    preparadas = {}   # entrada -> tokens (o la excepción al tokenizar); las repetidas se preparan una vez
+    claves = set()
+    for entrada in oraciones:
+        if entrada in preparadas:
+            continue
+        try:
+            toks = preparar_tokens(entrada)
+            if not toks:
+                raise ValueError("Oración vacía.")
+            claves |= claves_oracion(toks)
+        except Exception as e:
+            toks = e
+        preparadas[entrada] = toks
+    tabla = resolver_claves(claves)
+
+    hechas = {}
+    resultados = []
+    for entrada in oraciones:
+        if entrada not in hechas:
+            futuro = es_futuro_inmediato(entrada)
+            traducir = traducir_futuro_inmediato if futuro else traducir_oracion
+            inicio = time.perf_counter()
+            salida, error = None, None
+            try:
+                toks = preparadas[entrada]
+                if isinstance(toks, Exception):
+                    raise toks
+                salida = traducir(entrada, tabla, toks)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            hechas[entrada] = {
+                "entrada":   entrada,
+                "salida":    salida,
+                "modo":      "futuro_inmediato" if futuro else "oracion",
+                "error":     error,
+                "tiempo_ms": round((time.perf_counter() - inicio) * 1000, 3),
+            }
+        resultados.append(dict(hechas[entrada]))
+    return resultados
@@ -0,0 +1,129 @@
+# tts/cache_audio.py
+"""
+Caché en disco del audio sintetizado, direccionada por contenido: la clave es el
+sha256 de (texto, voz, velocidad, volumen), así que la misma traducción con la
+misma voz nunca se vuelve a sintetizar. Se escribe de forma atómica y, al pasar
+de TRADUCTOR_TTS_CACHE_MB, se borran los archivos usados hace más tiempo.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+TTS_CACHE_DIR = os.environ.get("TRADUCTOR_TTS_CACHE_DIR",
+                               os.path.join(tempfile.gettempdir(), "traductor_kichwa_tts"))
+TTS_CACHE_MB  = float(os.environ.get("TRADUCTOR_TTS_CACHE_MB", "200"))
+EXTENSION = ".mp3"
+EXTENSIONES = (".mp3", ".opus")   # formatos que cuentan para el límite de tamaño
+TEMPORAL_HUERFANO = 3600   # segundos antes de borrar un .tmp abandonado
+
+def clave_audio(texto: str, voz: str, velocidad: int, volumen: float) -> str:
+    datos = json.dumps([texto, voz, velocidad, volumen], ensure_ascii=False)
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+class CacheAudio:
+    def __init__(self, carpeta: str = TTS_CACHE_DIR, max_bytes: int = int(TTS_CACHE_MB * 1024 * 1024)):
+        self.carpeta = carpeta
+        self.max_bytes = max_bytes
+        os.makedirs(carpeta, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def ruta(self, clave: str, extension: str = EXTENSION) -> str:
+        return os.path.join(self.carpeta, clave + extension)
+
+    def tocar(self, ruta: str) -> bool:
+        """Marca el archivo como recién usado (el mtime ordena la LRU); False si ya no existe."""
+        try:
+            os.utime(ruta)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def obtener(self, clave: str, extension: str = EXTENSION) -> Optional[bytes]:
+        ruta = self.ruta(clave, extension)
+        try:
+            with open(ruta, "rb") as f:
+                datos = f.read()
+        except FileNotFoundError:
+            return None
+        self.tocar(ruta)
+        return datos
+
+    def guardar_desde(self, clave: str, escribir: Callable[[str], None], extension: str = EXTENSION) -> str:
+        """`escribir(ruta_temporal)` genera el archivo; se mueve a su sitio de forma atómica."""
+        fd, temporal = tempfile.mkstemp(suffix=".tmp", dir=self.carpeta)
+        os.close(fd)
+        try:
+            escribir(temporal)
+            if os.path.getsize(temporal) == 0:
+                raise RuntimeError("La síntesis de voz no produjo audio.")
+            os.replace(temporal, self.ruta(clave, extension))
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        self.podar()
+        return self.ruta(clave, extension)
+
+    def asegurar(self, clave: str, escribir: Callable[[str], None], extension: str = EXTENSION) -> str:
+        """Ruta del archivo de `clave`, creándolo si falta; una sola síntesis por clave aunque varias sesiones la pidan a la vez."""
+        ruta = self.ruta(clave, extension)
+        if self.tocar(ruta):
+            return ruta
+        with self._locks_lock:
+            lock = self._locks.setdefault(clave + extension, threading.Lock())
+        with lock:
+            if not self.tocar(ruta):
+                self.guardar_desde(clave, escribir, extension)
+        with self._locks_lock:
+            self._locks.pop(clave + extension, None)
+        return ruta
+
+    def obtener_o_crear(self, clave: str, escribir: Callable[[str], None]) -> bytes:
+        datos = self.obtener(clave)
+        if datos is None:
+            with open(self.asegurar(clave, escribir), "rb") as f:
+                datos = f.read()
+        return datos
+
+    def podar(self):
+        """Borra los archivos usados hace más tiempo hasta quedar bajo max_bytes."""
+        archivos = []
+        ahora = time.time()
+        for nombre in os.listdir(self.carpeta):
+            try:
+                st = os.stat(os.path.join(self.carpeta, nombre))
+            except FileNotFoundError:
+                continue
+            if nombre.endswith(EXTENSIONES):
+                archivos.append((st.st_mtime, st.st_size, nombre))
+            elif nombre.endswith(".tmp") and ahora - st.st_mtime > TEMPORAL_HUERFANO:
+                # restos de una síntesis que superó su límite de tiempo
+                try:
+                    os.remove(os.path.join(self.carpeta, nombre))
+                except FileNotFoundError:
+                    pass
+        total = sum(tam for _, tam, _ in archivos)
+        for _, tam, nombre in sorted(archivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.carpeta, nombre))
+            except FileNotFoundError:
+                pass
+            total -= tam
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def obtener_cache_audio() -> CacheAudio:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheAudio()
+    return _cache
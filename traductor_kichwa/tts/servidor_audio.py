@@ -0,0 +1,153 @@
+# tts/servidor_audio.py
+"""
+Servidor HTTP local, en un hilo junto a la app, que sirve el audio de la caché
+en /audio/<sha256>.mp3 (u .opus). La página solo lleva la URL, no el audio en
+base64. Como el nombre es el hash del contenido, las respuestas son inmutables:
+ETag, Cache-Control immutable y peticiones Range para que el navegador pueda
+buscar en el audio y reutilizarlo entre reproducciones.
+
+Solo se usa con TRADUCTOR_AUDIO_URL_BASE, la URL con la que el navegador llega a
+este servidor (p.ej. https://ejemplo.org/tts detrás del mismo proxy HTTPS que la
+app). Sin ella el audio va dentro de la página: 127.0.0.1 no es alcanzable desde
+otro equipo y una URL http en una página https se bloquea como contenido mixto.
+
+Con TRADUCTOR_AUDIO_OPUS=1 y ffmpeg en el PATH se sirve Opus, más compacto que el MP3.
+"""
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from traductor_kichwa.tts.cache_audio import obtener_cache_audio
+from traductor_kichwa.tts.trabajadores import asegurar_audio
+
+AUDIO_HOST     = os.environ.get("TRADUCTOR_AUDIO_HOST", "127.0.0.1")
+AUDIO_PUERTO   = int(os.environ.get("TRADUCTOR_AUDIO_PUERTO", "8766"))    # 0 = audio en la página, sin servidor
+AUDIO_URL_BASE = os.environ.get("TRADUCTOR_AUDIO_URL_BASE", "")           # vacía = audio en la página, sin servidor
+AUDIO_OPUS     = os.environ.get("TRADUCTOR_AUDIO_OPUS", "0") == "1"
+
+log = logging.getLogger(__name__)
+
+TIPOS = {".mp3": "audio/mpeg", ".opus": "audio/ogg; codecs=opus"}
+_RUTA_AUDIO = re.compile(r"^/audio/([0-9a-f]{64})(\.mp3|\.opus)$")
+_RANGO = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def _rango(cabecera: Optional[str], tamano: int):
+    """(inicio, fin) inclusivo de una cabecera Range de un solo tramo; None si no hay; False si no se puede servir."""
+    if not cabecera:
+        return None
+    m = _RANGO.match(cabecera.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return None   # rangos múltiples o raros: se responde el archivo entero
+    if m.group(1):
+        inicio = int(m.group(1))
+        fin = min(int(m.group(2)), tamano - 1) if m.group(2) else tamano - 1
+    else:   # "bytes=-N": los últimos N bytes
+        inicio, fin = max(0, tamano - int(m.group(2))), tamano - 1
+    if inicio >= tamano or inicio > fin:
+        return False
+    return inicio, fin
+
+class _ManejadorAudio(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self._servir(cuerpo=False)
+
+    def do_GET(self):
+        self._servir(cuerpo=True)
+
+    def _servir(self, cuerpo: bool):
+        m = _RUTA_AUDIO.match(self.path.split("?")[0])
+        if not m:
+            self.send_error(404)
+            return
+        clave, extension = m.groups()
+        cache = obtener_cache_audio()
+        ruta = cache.ruta(clave, extension)
+        try:
+            tamano = os.path.getsize(ruta)
+        except OSError:
+            self.send_error(404)
+            return
+        cache.tocar(ruta)
+
+        etag = f'"{clave}{extension}"'
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        rango = _rango(self.headers.get("Range"), tamano)
+        if rango is False:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{tamano}")
+            self.end_headers()
+            return
+        inicio, fin = rango or (0, tamano - 1)
+        self.send_response(206 if rango else 200)
+        self.send_header("Content-Type", TIPOS[extension])
+        self.send_header("Content-Length", str(fin - inicio + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        if rango:
+            self.send_header("Content-Range", f"bytes {inicio}-{fin}/{tamano}")
+        self.end_headers()
+        if cuerpo:
+            with open(ruta, "rb") as f:
+                f.seek(inicio)
+                self.wfile.write(f.read(fin - inicio + 1))
+
+    def log_message(self, *args):
+        pass
+
+_servidor = None
+_servidor_fallo = False
+_servidor_lock = threading.Lock()
+
+def iniciar_servidor_audio(puerto: int = AUDIO_PUERTO, host: str = AUDIO_HOST) -> Optional[ThreadingHTTPServer]:
+    """Arranca (una sola vez por proceso) el servidor de audio en un hilo daemon."""
+    global _servidor, _servidor_fallo
+    if not puerto:
+        return None
+    with _servidor_lock:
+        if _servidor is None and not _servidor_fallo:
+            try:
+                _servidor = ThreadingHTTPServer((host, puerto), _ManejadorAudio)
+            except OSError as e:
+                _servidor_fallo = True
+                log.warning("No se pudo abrir el puerto de audio %s:%s: %s", host, puerto, e)
+                return None
+            _servidor.daemon_threads = True
+            threading.Thread(target=_servidor.serve_forever, name="audio", daemon=True).start()
+    return _servidor
+
+def _a_opus(origen: str):
+    def escribir(destino):
+        subprocess.run([shutil.which("ffmpeg"), "-y", "-loglevel", "error", "-i", origen,
+                        "-c:a", "libopus", "-b:a", "24k", "-f", "ogg", destino],
+                       check=True, timeout=30)
+    return escribir
+
+def url_audio(texto: str) -> Optional[str]:
+    """
+    URL del audio de `texto` (sintetizándolo si hace falta), o None si no hay
+    TRADUCTOR_AUDIO_URL_BASE o el servidor no está disponible y hay que mandar el
+    audio dentro de la página.
+    """
+    if not AUDIO_URL_BASE or iniciar_servidor_audio() is None:
+        return None
+    clave = asegurar_audio(texto)
+    extension = ".mp3"
+    if AUDIO_OPUS and shutil.which("ffmpeg"):
+        cache = obtener_cache_audio()
+        try:
+            cache.asegurar(clave, _a_opus(cache.ruta(clave)), ".opus")
+            extension = ".opus"
+        except (subprocess.SubprocessError, OSError, RuntimeError) as e:
+            log.warning("No se pudo convertir a Opus, se sirve MP3: %s", e)
+    return f"{AUDIO_URL_BASE.rstrip('/')}/audio/{clave}{extension}"
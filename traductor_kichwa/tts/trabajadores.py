@@ -0,0 +1,132 @@
+# tts/trabajadores.py
+"""
+Síntesis de voz fuera del hilo de Streamlit: un pool acotado de procesos, cada uno
+con su propio motor pyttsx3 (runAndWait bloquea, y un motor compartido serializaba
+toda la app). Las peticiones esperan turno con un semáforo: si la cola está llena
+más de TTS_ESPERA_COLA segundos se rechazan, y cada síntesis tiene su propio límite:
+si se pasa, los procesos del pool se matan (un runAndWait colgado no se puede
+cancelar) y la próxima petición abre un pool nuevo.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturoTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from traductor_kichwa.tts.cache_audio import clave_audio, obtener_cache_audio
+
+TTS_VOZ       = os.environ.get("TRADUCTOR_TTS_VOZ", "spanish")
+TTS_VELOCIDAD = int(os.environ.get("TRADUCTOR_TTS_VELOCIDAD", "100"))     # más lento (valor típico: 100-150)
+TTS_VOLUMEN   = float(os.environ.get("TRADUCTOR_TTS_VOLUMEN", "0.8"))     # más suave (0.0 a 1.0)
+
+TTS_PROCESOS      = int(os.environ.get("TRADUCTOR_TTS_PROCESOS", "2"))
+TTS_PENDIENTES    = int(os.environ.get("TRADUCTOR_TTS_PENDIENTES", "8"))      # en cola + en curso
+TTS_ESPERA_COLA   = float(os.environ.get("TRADUCTOR_TTS_ESPERA_COLA", "2"))   # segundos esperando turno
+TTS_ESPERA_SINTESIS = float(os.environ.get("TRADUCTOR_TTS_ESPERA", "30"))     # segundos por síntesis
+
+_motor = None   # uno por proceso trabajador
+
+def _iniciar_trabajador(voz: str, velocidad: int, volumen: float):
+    global _motor
+    import pyttsx3
+    _motor = pyttsx3.init()
+    _motor.setProperty('rate', velocidad)
+    _motor.setProperty('volume', volumen)
+    _motor.setProperty('voice', voz)
+
+def _sintetizar(texto: str, ruta: str):
+    _motor.save_to_file(texto, ruta)
+    _motor.runAndWait()
+
+class PoolTTS:
+    def __init__(self, procesos: int = TTS_PROCESOS, pendientes: int = TTS_PENDIENTES,
+                 espera_cola: float = TTS_ESPERA_COLA, espera: float = TTS_ESPERA_SINTESIS):
+        if procesos < 1 or pendientes < 1:
+            raise ValueError("El pool de voz necesita al menos un proceso y un puesto en la cola.")
+        self.procesos = procesos
+        self.pendientes = pendientes
+        self.espera_cola = espera_cola
+        self.espera = espera
+        self._cupos = threading.BoundedSemaphore(pendientes)
+        self._lock = threading.Lock()
+        self._ejecutor = None
+
+    def _obtener_ejecutor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._ejecutor is None:
+                # spawn: el servidor de Streamlit tiene muchos hilos y hacer fork de él no es seguro
+                self._ejecutor = ProcessPoolExecutor(
+                    self.procesos, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_iniciar_trabajador, initargs=(TTS_VOZ, TTS_VELOCIDAD, TTS_VOLUMEN))
+            return self._ejecutor
+
+    def _descartar_ejecutor(self, ejecutor, matar: bool = False):
+        """
+        Deja de usar `ejecutor`; con `matar`, termina también sus procesos. Los trabajos
+        que aún tuviera fallan con BrokenProcessPool y devuelven su cupo.
+        """
+        with self._lock:
+            if self._ejecutor is ejecutor:
+                self._ejecutor = None
+        if matar:
+            # ProcessPoolExecutor no tiene forma pública de parar un trabajo en curso (kill_workers es de 3.14)
+            if hasattr(ejecutor, "kill_workers"):
+                ejecutor.kill_workers()
+            else:
+                for proceso in list((ejecutor._processes or {}).values()):
+                    proceso.kill()
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    def sintetizar(self, texto: str, ruta: str):
+        """Escribe el audio de `texto` en `ruta` usando un proceso del pool."""
+        if not self._cupos.acquire(timeout=self.espera_cola):
+            raise TimeoutError(f"El servicio de voz está ocupado ({self.pendientes} peticiones pendientes).")
+        ejecutor = self._obtener_ejecutor()
+        try:
+            futuro = ejecutor.submit(_sintetizar, texto, ruta)
+        except BaseException:
+            self._cupos.release()
+            raise
+        # el cupo se libera cuando el trabajo termina de verdad, aunque aquí se deje de esperar
+        futuro.add_done_callback(lambda _: self._cupos.release())
+        try:
+            futuro.result(timeout=self.espera)
+        except FuturoTimeout:
+            if not futuro.cancel():
+                # ya corre en un trabajador: sin matarlo seguiría ocupando su proceso y su cupo
+                self._descartar_ejecutor(ejecutor, matar=True)
+            raise TimeoutError(f"La síntesis de voz tardó más de {self.espera}s.")
+        except BrokenProcessPool:
+            self._descartar_ejecutor(ejecutor)   # un trabajador murió: la próxima petición abre otro pool
+            raise
+
+    def cerrar(self):
+        with self._lock:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def obtener_pool_tts() -> PoolTTS:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolTTS()
+    return _pool
+
+def _escribir_con_pool(texto: str):
+    return lambda ruta: obtener_pool_tts().sintetizar(texto, ruta)
+
+def sintetizar_audio(texto: str) -> bytes:
+    """Audio de `texto` desde la caché en disco o, si no está, sintetizado en el pool."""
+    clave = clave_audio(texto, TTS_VOZ, TTS_VELOCIDAD, TTS_VOLUMEN)
+    return obtener_cache_audio().obtener_o_crear(clave, _escribir_con_pool(texto))
+
+def asegurar_audio(texto: str) -> str:
+    """Como sintetizar_audio, pero sin leer el archivo: devuelve su clave en la caché."""
+    clave = clave_audio(texto, TTS_VOZ, TTS_VELOCIDAD, TTS_VOLUMEN)
+    obtener_cache_audio().asegurar(clave, _escribir_con_pool(texto))
+    return clave
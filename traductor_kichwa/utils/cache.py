@@ -0,0 +1,107 @@
+# utils/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from traductor_kichwa.utils.traza import contar_cache
+
+FALTA = object()   # lo que devuelve obtener() cuando la clave no está (None puede ser un valor válido)
+
+class CacheLRU:
+    """
+    Caché acotada y segura entre hilos: expulsa la entrada usada hace más tiempo
+    cuando se llena y, si se da un ttl (segundos), descarta las entradas vencidas.
+    Lleva contadores de aciertos, fallos, expulsiones y vencimientos.
+    """
+    def __init__(self, max_entradas: int, ttl: Optional[float] = None):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()   # clave -> (valor, instante de vencimiento o None)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.vencidas = 0
+
+    def obtener(self, clave: Hashable) -> Any:
+        with self._lock:
+            item = self._datos.get(clave)
+            if item is None:
+                self.fallos += 1
+                return FALTA
+            valor, vence = item
+            if vence is not None and time.monotonic() > vence:
+                del self._datos[clave]
+                self.vencidas += 1
+                self.fallos += 1
+                return FALTA
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave: Hashable, valor: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        vence = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._datos[clave] = (valor, vence)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.expulsiones += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas":    len(self._datos),
+                "max_entradas": self.max_entradas,
+                "aciertos":    self.aciertos,
+                "fallos":      self.fallos,
+                "expulsiones": self.expulsiones,
+                "vencidas":    self.vencidas,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
+
+class Memo:
+    """
+    Memo de búsquedas que guarda los aciertos y también los fallos (valor vacío),
+    cada uno en su propia CacheLRU con su propio límite. Los valores se guardan tal
+    cual: quien lo use debe guardar valores inmutables (tuplas) o copiarlos al leer.
+    """
+    def __init__(self, nombre: str, max_aciertos: int, max_fallos: int, ttl: Optional[float] = None):
+        self.nombre = nombre
+        self._aciertos = CacheLRU(max_aciertos, ttl)
+        self._fallos = CacheLRU(max_fallos, ttl)
+
+    def obtener(self, clave: Hashable) -> Any:
+        valor = self._aciertos.obtener(clave)
+        if valor is FALTA:
+            valor = self._fallos.obtener(clave)
+        contar_cache(self.nombre, valor is not FALTA)
+        return valor
+
+    def guardar(self, clave: Hashable, valor: Any):
+        (self._aciertos if valor else self._fallos).guardar(clave, valor)
+
+    def limpiar(self):
+        self._aciertos.limpiar()
+        self._fallos.limpiar()
+
+    def estadisticas(self) -> dict:
+        aciertos, fallos = self._aciertos.estadisticas(), self._fallos.estadisticas()
+        # un fallo del memo es una clave que no está en ninguna de sus dos LRU
+        n_aciertos, n_fallos = aciertos["aciertos"] + fallos["aciertos"], fallos["fallos"]
+        return {
+            "entradas":      aciertos["entradas"] + fallos["entradas"],
+            "aciertos":      n_aciertos,
+            "fallos":        n_fallos,
+            "tasa_aciertos": n_aciertos / (n_aciertos + n_fallos) if n_aciertos + n_fallos else 0.0,
+        }
@@ -0,0 +1,78 @@
+# utils/estaticos.py
+"""
+Imágenes del tema (p. ej. el fondo) publicadas en static/compilados/ con el hash
+del contenido en el nombre, para que Streamlit las sirva como estáticos
+(server.enableStaticServing) y el navegador las guarde en caché en vez de recibir
+la imagen en base64 en cada página. Solo imágenes: Streamlit sirve .css, .js y
+demás como text/plain con nosniff, y el navegador rechaza esa hoja de estilos;
+el CSS va en línea.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional
+
+# Streamlit sirve la carpeta static/ que está junto al script principal en app/static/
+CARPETA_ESTATICA = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "static")
+SUBCARPETA = "compilados"
+URL_ESTATICA = "app/static"
+
+_publicados = {}   # (nombre, hash) -> nombre de archivo
+_lock = threading.Lock()
+
+def servicio_estatico_activo() -> bool:
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def publicar(nombre: str, extension: str, contenido: bytes) -> str:
+    """
+    Escribe `contenido` como static/compilados/<nombre>.<hash><extension> (de forma
+    atómica y solo si no existe) y devuelve la ruta relativa a static/. Borra las
+    versiones anteriores del mismo nombre. OSError si la carpeta no es escribible.
+    """
+    resumen = hashlib.sha256(contenido).hexdigest()[:16]
+    archivo = f"{nombre}.{resumen}{extension}"
+    with _lock:
+        if (nombre, resumen) in _publicados:
+            return _publicados[(nombre, resumen)]
+        carpeta = os.path.join(CARPETA_ESTATICA, SUBCARPETA)
+        os.makedirs(carpeta, exist_ok=True)
+        destino = os.path.join(carpeta, archivo)
+        if not os.path.exists(destino):
+            fd, temporal = tempfile.mkstemp(suffix=".tmp", dir=carpeta)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(contenido)
+                os.chmod(temporal, 0o644)
+                os.replace(temporal, destino)
+            except BaseException:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+        for otro in os.listdir(carpeta):
+            if otro != archivo and otro.startswith(nombre + ".") and otro.endswith(extension) \
+                    and len(otro) == len(archivo):
+                try:
+                    os.remove(os.path.join(carpeta, otro))
+                except OSError:
+                    pass
+        _publicados[(nombre, resumen)] = f"{SUBCARPETA}/{archivo}"
+        return _publicados[(nombre, resumen)]
+
+def publicar_archivo(ruta: str) -> Optional[str]:
+    """Publica una copia de `ruta` (p. ej. la imagen de fondo); None si no existe."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    nombre, extension = os.path.splitext(os.path.basename(ruta))
+    return publicar(nombre, extension, contenido)
+
+def url_estatica(relativa: str) -> str:
+    # el ?v= hace que Tornado responda con caché de larga duración
+    version = relativa.rsplit(".", 2)[-2]
+    return f"{URL_ESTATICA}/{relativa}?v={version}"
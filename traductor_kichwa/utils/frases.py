@@ -0,0 +1,53 @@
+# utils/frases.py
+from typing import Iterable
+from traductor_kichwa.db.lexico import clave_busqueda
+
+_FIN = None   # marca de "aquí termina una frase" dentro del trie (ninguna palabra es None)
+
+class AutomataFrases:
+    """
+    Trie por palabras con todas las frases conocidas de 2 o más palabras
+    (frase_es de traduccion_morfema y formas verbales compuestas).
+    segmentar() recorre los tokens una sola vez y agrupa siempre la
+    coincidencia más larga, sin límite de tamaño.
+    """
+    def __init__(self, frases: Iterable[str] = ()):
+        self.raiz = {}
+        self.total = 0
+        for frase in frases:
+            self.agregar(frase)
+
+    def agregar(self, frase: str):
+        palabras = clave_busqueda(frase).split()
+        if len(palabras) < 2:
+            return
+        nodo = self.raiz
+        for palabra in palabras:
+            nodo = nodo.setdefault(palabra, {})
+        if _FIN not in nodo:
+            nodo[_FIN] = True
+            self.total += 1
+
+    def coincidencia_mas_larga(self, claves: list[str], i: int) -> int:
+        """Cuántos tokens desde la posición i forman la frase más larga conocida (0 si ninguna)."""
+        nodo, largo = self.raiz, 0
+        for j in range(i, len(claves)):
+            nodo = nodo.get(claves[j])
+            if nodo is None:
+                break
+            if _FIN in nodo:
+                largo = j - i + 1
+        return largo
+
+    def segmentar(self, tokens: list[str]) -> list[str]:
+        claves = [clave_busqueda(t) for t in tokens]
+        out, i, n = [], 0, len(tokens)
+        while i < n:
+            largo = self.coincidencia_mas_larga(claves, i)
+            if largo:
+                out.append(' '.join(tokens[i:i+largo]))
+                i += largo
+            else:
+                out.append(tokens[i])
+                i += 1
+        return out
@@ -0,0 +1,42 @@
+# utils/imagenes.py
+"""
+Imágenes de la interfaz ya decodificadas, redimensionadas y codificadas como PNG
+optimizado, una vez por proceso. La clave incluye mtime y tamaño del archivo, así
+que si se reemplaza una imagen se vuelve a procesar sola; los reruns de Streamlit
+solo hacen un stat().
+"""
+import io
+import os
+from typing import Optional
+
+from PIL import Image
+
+from traductor_kichwa.utils.cache import CacheLRU, FALTA
+
+CARPETA_IMAGENES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "imagenes")
+
+_imagenes = CacheLRU(256)
+
+def imagen_redimensionada(ruta: str, ancho: int, alto: int) -> Optional[bytes]:
+    """
+    PNG de `ruta` (absoluta o relativa a traductor_kichwa/imagenes) a ancho×alto,
+    o None si el archivo no existe. Los errores de PIL se propagan.
+    """
+    if not os.path.isabs(ruta):
+        ruta = os.path.join(CARPETA_IMAGENES, ruta)
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    clave = (ruta, st.st_mtime_ns, st.st_size, ancho, alto)
+    png = _imagenes.obtener(clave)
+    if png is FALTA:
+        with Image.open(ruta) as img:
+            if img.mode not in ("RGB", "RGBA", "L", "LA"):
+                img = img.convert("RGBA")   # paletas y CMYK: LANCZOS necesita color directo
+            img = img.resize((ancho, alto), Image.Resampling.LANCZOS)
+            salida = io.BytesIO()
+            img.save(salida, format="PNG", optimize=True)
+        png = salida.getvalue()
+        _imagenes.guardar(clave, png)
+    return png
@@ -0,0 +1,224 @@
+# utils/metricas.py
+"""
+Métricas del traductor en formato de texto de Prometheus, servidas por un
+pequeño servidor HTTP local que corre en un hilo junto a la app de Streamlit:
+
+    curl http://127.0.0.1:9108/metrics
+
+Contadores e histogramas propios (sin dependencias); los valores que ya llevan
+otros módulos (pool, cachés) se leen en cada scrape con `registrar_recolector`.
+Mientras el servidor no esté sirviendo (TRADUCTOR_METRICAS_PUERTO=0, puerto ocupado,
+scripts y benchmarks) los decoradores no miden nada: solo llaman a la función.
+"""
+import bisect
+import functools
+import logging
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+METRICAS_HOST   = os.environ.get("TRADUCTOR_METRICAS_HOST", "127.0.0.1")
+METRICAS_PUERTO = int(os.environ.get("TRADUCTOR_METRICAS_PUERTO", "9108"))   # 0 = no servir métricas
+
+log = logging.getLogger(__name__)
+
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _etiquetas(pares: Iterable[Tuple[str, str]]) -> str:
+    pares = list(pares)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class Contador:
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre, self.ayuda, self.etiquetas = nombre, ayuda, etiquetas
+        self._valores: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1, **etiquetas):
+        clave = tuple(etiquetas[e] for e in self.etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + n
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            valores = dict(self._valores)
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} counter"]
+        for clave, valor in sorted(valores.items()):
+            lineas.append(f"{self.nombre}{_etiquetas(zip(self.etiquetas, clave))} {_numero(valor)}")
+        return lineas
+
+class Histograma:
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = BUCKETS_SEGUNDOS):
+        self.nombre, self.ayuda, self.etiquetas = nombre, ayuda, etiquetas
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}   # clave -> [cuentas por bucket..., suma, total]
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, **etiquetas):
+        clave = tuple(etiquetas[e] for e in self.etiquetas)
+        i = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                serie[i] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        for clave, serie in sorted(series.items()):
+            base = list(zip(self.etiquetas, clave))
+            acumulado = 0
+            for limite, cuenta in zip(self.buckets, serie):
+                acumulado += cuenta
+                lineas.append(f"{self.nombre}_bucket{_etiquetas(base + [('le', _numero(limite))])} {acumulado}")
+            lineas.append(f"{self.nombre}_bucket{_etiquetas(base + [('le', '+Inf')])} {serie[-1]}")
+            lineas.append(f"{self.nombre}_sum{_etiquetas(base)} {_numero(serie[-2])}")
+            lineas.append(f"{self.nombre}_count{_etiquetas(base)} {serie[-1]}")
+        return lineas
+
+    def cronometrar(self, **etiquetas):
+        """Decorador: observa la duración de cada llamada (también las que fallan) si hay servidor."""
+        def decorar(funcion):
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if not activas:
+                    return funcion(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return funcion(*args, **kwargs)
+                finally:
+                    self.observar(time.perf_counter() - inicio, **etiquetas)
+            return envoltura
+        return decorar
+
+_metricas: List = []
+_recolectores: List[Callable] = []
+
+def contador(nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()) -> Contador:
+    m = Contador(nombre, ayuda, etiquetas)
+    _metricas.append(m)
+    return m
+
+def histograma(nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (), **kwargs) -> Histograma:
+    m = Histograma(nombre, ayuda, etiquetas, **kwargs)
+    _metricas.append(m)
+    return m
+
+def registrar_recolector(funcion: Callable):
+    """
+    `funcion()` se llama en cada scrape y devuelve una lista de
+    (nombre, tipo, ayuda, [(dict de etiquetas, valor), ...]). Se puede usar como decorador.
+    """
+    _recolectores.append(funcion)
+    return funcion
+
+# Métricas del traductor
+TRADUCCIONES = contador("traductor_traducciones_total", "Traducciones servidas", ("punto",))
+ERRORES = contador("traductor_errores_total", "Traducciones fallidas por tipo de error", ("punto", "tipo"))
+LATENCIA = histograma("traductor_latencia_segundos", "Latencia por punto de entrada", ("punto",))
+LATENCIA_CONSULTAS = histograma("traductor_consulta_segundos",
+                                "Latencia de cada función de db/consultas.py", ("funcion",))
+
+def tipo_error(e: Exception) -> str:
+    """Mensaje sin los valores entre comillas: "Pronombre 'hola' no registrado..." -> "Pronombre no registrado..."."""
+    mensaje = re.sub(r"\s*'[^']*'", "", str(e)).strip()
+    return mensaje or type(e).__name__
+
+def observar_traduccion(punto: str):
+    """Decorador para los puntos de entrada: cuenta traducciones, errores por tipo y latencia."""
+    def decorar(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not activas:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except Exception as e:
+                ERRORES.inc(punto=punto, tipo=tipo_error(e))
+                raise
+            else:
+                TRADUCCIONES.inc(punto=punto)
+                return resultado
+            finally:
+                LATENCIA.observar(time.perf_counter() - inicio, punto=punto)
+        return envoltura
+    return decorar
+
+def exportar() -> str:
+    lineas = []
+    for m in _metricas:
+        lineas.extend(m.exportar())
+    for recolector in _recolectores:
+        try:
+            familias = recolector()
+        except Exception as e:   # un recolector roto no debe tumbar el scrape entero
+            log.warning("Error en el recolector de métricas %s: %s", recolector.__name__, e)
+            continue
+        for nombre, tipo, ayuda, muestras in familias:
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for etiquetas, valor in muestras:
+                lineas.append(f"{nombre}{_etiquetas(sorted(etiquetas.items()))} {_numero(valor)}")
+    return "\n".join(lineas) + "\n"
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        cuerpo = exportar().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):   # sin una línea en la consola por cada scrape
+        pass
+
+_servidor = None
+_servidor_fallo = False   # no reintentar en cada rerun si el puerto estaba ocupado
+_servidor_lock = threading.Lock()
+# True mientras el servidor sirve /metrics; sin él nadie leería las métricas y no se mide nada
+activas = False
+
+def iniciar_servidor_metricas(puerto: int = METRICAS_PUERTO, host: str = METRICAS_HOST) -> Optional[ThreadingHTTPServer]:
+    """
+    Arranca (una sola vez por proceso) el servidor de /metrics en un hilo daemon.
+    Se puede llamar en cada rerun de Streamlit. Si el puerto está ocupado o es 0, no hace nada.
+    """
+    global _servidor, _servidor_fallo, activas
+    if not puerto:
+        return None
+    with _servidor_lock:
+        if _servidor is None and not _servidor_fallo:
+            try:
+                _servidor = ThreadingHTTPServer((host, puerto), _ManejadorMetricas)
+            except OSError as e:
+                _servidor_fallo = True
+                log.warning("No se pudo abrir el puerto de métricas %s:%s: %s", host, puerto, e)
+                return None
+            _servidor.daemon_threads = True
+            threading.Thread(target=_servidor.serve_forever, name="metricas", daemon=True).start()
+            activas = True
+    return _servidor
@@ -0,0 +1,177 @@
+# utils/perfilador.py
+"""
+Perfilado opcional de traducciones reales, controlado por variables de entorno:
+
+    TRADUCTOR_PERFIL_MUESTRA=0.01     perfila con cProfile el 1% de las llamadas (archivos .pstats)
+    TRADUCTOR_PERFIL_UMBRAL_MS=200    muestrea la pila de todas las llamadas y guarda las que
+                                      tarden más de 200 ms como pilas colapsadas (.folded)
+    TRADUCTOR_PERFIL_DIR              carpeta de salida (rotativa)
+    TRADUCTOR_PERFIL_MAX_ARCHIVOS     cuántos archivos se conservan (se borran los más viejos)
+    TRADUCTOR_PERFIL_INTERVALO_MS     periodo del muestreador de pilas
+
+Los .pstats se abren con `python -m pstats` o snakeviz; los .folded con flamegraph.pl
+o speedscope. Si no se define ninguna de las dos primeras variables, `perfilar`
+devuelve la función tal cual: sin coste alguno. Un perfil que no se puede guardar
+solo deja un aviso en el log: el perfilado nunca hace fallar una traducción.
+"""
+import cProfile
+import functools
+import itertools
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+PERFIL_MUESTRA   = float(os.environ.get("TRADUCTOR_PERFIL_MUESTRA", "0"))      # fracción de llamadas (0 a 1)
+PERFIL_UMBRAL_MS = float(os.environ.get("TRADUCTOR_PERFIL_UMBRAL_MS", "0"))    # 0 = sin muestreador de pilas
+PERFIL_DIR       = os.environ.get("TRADUCTOR_PERFIL_DIR",
+                                  os.path.join(tempfile.gettempdir(), "traductor_kichwa_perfiles"))
+PERFIL_MAX_ARCHIVOS  = int(os.environ.get("TRADUCTOR_PERFIL_MAX_ARCHIVOS", "200"))
+PERFIL_INTERVALO_MS  = float(os.environ.get("TRADUCTOR_PERFIL_INTERVALO_MS", "5"))
+
+log = logging.getLogger(__name__)
+
+_secuencia = itertools.count(1)
+_rotar_lock = threading.Lock()
+# cProfile no admite dos perfiles activos a la vez (Python 3.12+): si ya hay uno, esa llamada no se perfila
+_cprofile_lock = threading.Lock()
+
+def _ruta(punto: str, duracion_ms: float, extension: str) -> str:
+    fecha = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(PERFIL_DIR, f"{fecha}_{punto}_{duracion_ms:.0f}ms_{os.getpid()}_{next(_secuencia)}{extension}")
+
+def _guardar(ruta: str, escribir):
+    """
+    Escribe de forma atómica con `escribir(ruta_temporal)` y rota la carpeta. No lanza
+    nunca: se llama en el finally de la traducción y no debe cambiar su resultado.
+    """
+    temporal = f"{ruta}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(PERFIL_DIR, exist_ok=True)
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    except Exception:
+        log.warning("No se pudo guardar el perfil %s", ruta, exc_info=True)
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        return
+    _rotar()
+
+def _rotar():
+    with _rotar_lock:
+        try:
+            archivos = [os.path.join(PERFIL_DIR, n) for n in os.listdir(PERFIL_DIR)
+                        if n.endswith((".pstats", ".folded"))]
+            archivos.sort(key=os.path.getmtime)
+            for viejo in archivos[:max(0, len(archivos) - PERFIL_MAX_ARCHIVOS)]:
+                os.remove(viejo)
+        except OSError:
+            pass   # otro proceso rotó a la vez
+
+class _MuestreadorPilas:
+    """
+    Un único hilo daemon que, mientras haya llamadas en curso, lee cada pocos
+    milisegundos la pila de sus hilos (sys._current_frames) y cuenta las pilas.
+    Los contadores solo se tocan con el lock tomado y solo mientras su llamada está
+    en `_activos`: cuando `terminar` vuelve, el Counter ya es solo del que llamó.
+    """
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self._activos: Dict[int, Counter] = {}
+        self._cond = threading.Condition()
+        self._hilo = None
+
+    def empezar(self) -> Counter:
+        pilas = Counter()
+        with self._cond:
+            self._activos[threading.get_ident()] = pilas
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._bucle, name="perfilador", daemon=True)
+                self._hilo.start()
+            self._cond.notify()
+        return pilas
+
+    def terminar(self):
+        with self._cond:
+            self._activos.pop(threading.get_ident(), None)
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                while not self._activos:
+                    self._cond.wait()
+                activos = dict(self._activos)
+            marcos = sys._current_frames()
+            muestras = [(id_hilo, pilas, _pila_colapsada(marcos[id_hilo]))
+                        for id_hilo, pilas in activos.items() if id_hilo in marcos]
+            del marcos
+            with self._cond:
+                for id_hilo, pilas, pila in muestras:
+                    # la llamada pudo terminar (o empezar otra en el mismo hilo) mientras se leían las pilas
+                    if self._activos.get(id_hilo) is pilas:
+                        pilas[pila] += 1
+            time.sleep(self.intervalo)
+
+def _pila_colapsada(marco) -> str:
+    partes = []
+    while marco is not None:
+        codigo = marco.f_code
+        partes.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+        marco = marco.f_back
+    return ";".join(reversed(partes))
+
+def _escribir_pilas(pilas: Counter):
+    def escribir(ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            for pila, n in pilas.most_common():
+                f.write(f"{pila} {n}\n")
+    return escribir
+
+_muestreador = None
+
+def perfilar(punto: str):
+    """
+    Decorador para un punto de entrada. Con el perfilado apagado devuelve la misma
+    función; encendido, perfila una muestra de llamadas con cProfile y/o guarda las
+    pilas de las llamadas lentas.
+    """
+    global _muestreador
+
+    def decorar(funcion):
+        if PERFIL_MUESTRA <= 0 and PERFIL_UMBRAL_MS <= 0:
+            return funcion
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if PERFIL_MUESTRA > 0 and random.random() < PERFIL_MUESTRA and _cprofile_lock.acquire(blocking=False):
+                perfil = cProfile.Profile()
+                inicio = time.perf_counter()
+                try:
+                    return perfil.runcall(funcion, *args, **kwargs)
+                finally:
+                    _cprofile_lock.release()
+                    duracion_ms = (time.perf_counter() - inicio) * 1000
+                    _guardar(_ruta(punto, duracion_ms, ".pstats"), perfil.dump_stats)
+            if PERFIL_UMBRAL_MS <= 0:
+                return funcion(*args, **kwargs)
+            pilas = _muestreador.empezar()
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _muestreador.terminar()
+                duracion_ms = (time.perf_counter() - inicio) * 1000
+                if duracion_ms >= PERFIL_UMBRAL_MS and pilas:
+                    _guardar(_ruta(punto, duracion_ms, ".folded"), _escribir_pilas(pilas))
+        return envoltura
+
+    if PERFIL_UMBRAL_MS > 0 and _muestreador is None:
+        _muestreador = _MuestreadorPilas(PERFIL_INTERVALO_MS / 1000)
+    return decorar
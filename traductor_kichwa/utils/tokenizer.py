@@ -1,4 +1,4 @@
-import unicodedata, re
+import math, unicodedata, re, threading, time
 try:
     from nltk.stem import SnowballStemmer
     stemmer = SnowballStemmer('spanish')
@@ -6,56 +6,58 @@ try:
 except ImportError:
     _HAS_NLTK = False
 
-from traductor_kichwa.db.consultas import buscar_morfema_desde_frase, buscar_conjugacion_auto
+from traductor_kichwa.db.consultas import (
+    obtener_frases_morfema, obtener_formas_verbales_compuestas, vencimiento_lexico,
+)
+from traductor_kichwa.db.lexico import al_recargar, lexico_activo
+from traductor_kichwa.utils.frases import AutomataFrases
+from traductor_kichwa.utils.traza import medir
 
+_automata = None   # (AutomataFrases, instante de vencimiento)
+_automata_lock = threading.Lock()
+
+@medir("normalizar_texto")
 def normalizar_texto(texto: str) -> str:
     texto = unicodedata.normalize('NFD', texto)
     texto = texto.encode('ascii','ignore').decode('utf-8')
     return texto.lower()
 
+@medir("tokenizar_oracion")
 def tokenizar_oracion(texto: str) -> list[str]:
     texto = re.sub(r'[^\w\s]', '', texto)
     return texto.split()
 
-def agrupar_ngramas(tokens: list[str], buscar_morfema_desde_frase) -> list[str]:
+def obtener_automata_frases() -> AutomataFrases:
     """
-    - Coge hasta 3-gramas para morfemas (p.ej. "en la" → pi).
-    - Luego, SI NO FUE morfema, agrupa pares para buscar CONTINUOS
-    (“esta cocinando”, “estamos jugando”…) usando buscar_conjugacion_auto.
+    Se compila con todas las frases de morfemas y los verbos compuestos. Con un léxico
+    activo vale hasta que se recarga; en modo mysql se recompila cada LEXICO_TTL segundos.
     """
-    out, i, n = [], 0, len(tokens)
-    while i < n:
-        # 1) morfemas compuestos (3 o 2 palabras)
-        match = None
-        for size in (3,2):
-            if i+size <= n:
-                frase = ' '.join(tokens[i:i+size])
-                if buscar_morfema_desde_frase(frase):
-                    match = frase
-                    break
-        if match:
-            out.append(match)
-            i += size
-            continue
-
-        # 2) verbos en continuo: "esta cocinando", "estamos jugando", etc.
-        if i+1 < n:
-            duo = f"{tokens[i]} {tokens[i+1]}"
-            # probamos con persona_id dummy (1–7) para ver si existe en cualquier persona
-            for pid in range(1,8):
-                if buscar_conjugacion_auto(duo, pid):
-                    out.append(duo)
-                    i += 2
-                    match = True
-                    break
-            if match:
-                continue
+    global _automata
+    automata = _automata
+    if automata is None or time.monotonic() > automata[1]:
+        with _automata_lock:
+            automata = _automata
+            if automata is None or time.monotonic() > automata[1]:
+                vence = math.inf if lexico_activo() is not None else vencimiento_lexico()
+                frases = list(obtener_frases_morfema())
+                frases.extend(obtener_formas_verbales_compuestas())
+                automata = _automata = (AutomataFrases(frases), vence)
+    return automata[0]
 
-        # 3) token suelto
-        out.append(tokens[i])
-        i += 1
+@al_recargar
+def _olvidar_automata():
+    global _automata
+    _automata = None
 
-    return out
+@medir("agrupar_ngramas")
+def agrupar_ngramas(tokens: list[str], buscar_morfema_desde_frase=None) -> list[str]:
+    """
+    Agrupa en una sola pasada, tomando siempre la frase conocida más larga:
+    - morfemas compuestos de cualquier tamaño (p.ej. "en la" → pi).
+    - verbos en continuo (“esta cocinando”, “estamos jugando”…).
+    `buscar_morfema_desde_frase` se acepta por compatibilidad pero ya no se usa.
+    """
+    return obtener_automata_frases().segmentar(tokens)
 
 def lematizar_palabra(token: str) -> str:
     if _HAS_NLTK:
@@ -0,0 +1,89 @@
+# utils/traza.py
+"""
+Trazas opcionales por traducción: tiempo por etapa, sentencias SQL, conexiones
+abiertas y aciertos/fallos de caché. Solo se registra algo dentro de
+`with trazar() as traza:`; fuera de él las funciones instrumentadas solo pagan
+una lectura de la ContextVar.
+"""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+class Traza:
+    def __init__(self):
+        self.etapas = {}        # nombre -> {"llamadas", "ms"}
+        self.contadores = {}    # "sql", "conexiones", ...
+        self.caches = {}        # nombre de la caché -> {"aciertos", "fallos"}
+        self.total_ms = 0.0
+
+    def sumar_etapa(self, nombre: str, segundos: float):
+        e = self.etapas.setdefault(nombre, {"llamadas": 0, "ms": 0.0})
+        e["llamadas"] += 1
+        e["ms"] += segundos * 1000
+
+    def como_dict(self) -> dict:
+        return {
+            "total_ms":   round(self.total_ms, 3),
+            "etapas":     {k: {"llamadas": v["llamadas"], "ms": round(v["ms"], 3)} for k, v in self.etapas.items()},
+            "sql":        self.contadores.get("sql", 0),
+            "conexiones": self.contadores.get("conexiones", 0),
+            "caches":     {k: dict(v) for k, v in self.caches.items()},
+        }
+
+_traza_actual: ContextVar[Optional[Traza]] = ContextVar("traza_actual", default=None)
+
+# la traza activa o None; es el .get de la ContextVar tal cual, sin otra llamada encima
+traza_actual = _traza_actual.get
+
+@contextmanager
+def trazar():
+    """Activa una traza nueva para el contexto actual (hilo o tarea) y la devuelve."""
+    traza = Traza()
+    token = _traza_actual.set(traza)
+    inicio = time.perf_counter()
+    try:
+        yield traza
+    finally:
+        traza.total_ms = (time.perf_counter() - inicio) * 1000
+        _traza_actual.reset(token)
+
+@contextmanager
+def etapa(nombre: str):
+    traza = _traza_actual.get()
+    if traza is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        traza.sumar_etapa(nombre, time.perf_counter() - inicio)
+
+def medir(nombre: str):
+    """Decorador: cada llamada cuenta como la etapa `nombre` de la traza activa."""
+    def decorar(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            traza = _traza_actual.get()
+            if traza is None:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                traza.sumar_etapa(nombre, time.perf_counter() - inicio)
+        return envoltura
+    return decorar
+
+def contar(nombre: str, n: int = 1):
+    traza = _traza_actual.get()
+    if traza is not None:
+        traza.contadores[nombre] = traza.contadores.get(nombre, 0) + n
+
+def contar_cache(nombre: str, acierto: bool):
+    traza = _traza_actual.get()
+    if traza is not None:
+        c = traza.caches.setdefault(nombre, {"aciertos": 0, "fallos": 0})
+        c["aciertos" if acierto else "fallos"] += 1